@@ -1,58 +1,65 @@
 #!/usr/bin/env python3
-"""Quick CLI helper for interactive aslan-browser control."""
-import sys, json, time
+"""Quick CLI helper for interactive aslan-browser control.
+
+Usage:
+    ab.py <cmd> [args...]      run a command (through the daemon if running)
+    ab.py --daemon             hold one browser connection on /tmp/ab-session.sock
+    ab.py --stop               stop a running daemon
+    ab.py --no-daemon <cmd>    run a command on a fresh connection
+"""
+import sys, json, time, os, io, socket, signal, contextlib
 from aslan_browser import AslanBrowser
 
-b = AslanBrowser()
-cmd = sys.argv[1] if len(sys.argv) > 1 else "tree"
+DAEMON_SOCK = "/tmp/ab-session.sock"
 
-try:
+
+def run(b, cmd, args):
     if cmd == "nav":
-        url = sys.argv[2]
-        wait = sys.argv[3] if len(sys.argv) > 3 else "load"
+        url = args[0]
+        wait = args[1] if len(args) > 1 else "load"
         r = b.navigate(url, wait_until=wait)
         print(json.dumps(r, indent=2))
 
     elif cmd == "tree":
+        # one write for the whole tree instead of a print per node
         tree = b.get_accessibility_tree()
-        for n in tree:
-            ref = n.get("ref","?")
-            role = n.get("role","?")
-            name = n.get("name","")[:70]
-            val = n.get("value","")
-            extra = f'  value="{val}"' if val else ""
-            print(f"{ref:8s} {role:14s} \"{name}\"{extra}")
+        sys.stdout.write("".join(
+            f"{n.get('ref','?'):8s} {n.get('role','?'):14s} \"{n.get('name','')[:70]}\""
+            + (f'  value="{n["value"]}"' if n.get("value") else "") + "\n"
+            for n in tree
+        ))
         print(f"\n({len(tree)} total nodes)")
 
     elif cmd == "click":
-        target = sys.argv[2]
+        target = args[0]
         b.click(target)
         print(f"Clicked {target}")
 
     elif cmd == "fill":
-        target = sys.argv[2]
-        value = sys.argv[3]
+        target = args[0]
+        value = args[1]
         b.fill(target, value)
         print(f"Filled {target} with '{value}'")
 
     elif cmd == "type":
-        # fill + small delay, for search boxes etc
-        target = sys.argv[2]
-        value = sys.argv[3]
-        b.click(target)
-        time.sleep(0.2)
-        b.fill(target, value)
+        # click + fill in one sequential call, for search boxes etc
+        target = args[0]
+        value = args[1]
+        b.type_into(target, value)
         print(f"Typed '{value}' into {target}")
 
     elif cmd == "key":
-        key = sys.argv[2]
+        key = args[0]
         b.keypress(key)
         print(f"Pressed {key}")
 
     elif cmd == "shot":
-        path = sys.argv[2] if len(sys.argv) > 2 else "/tmp/aslan-live.jpg"
-        quality = int(sys.argv[3]) if len(sys.argv) > 3 else 70
-        size = b.save_screenshot(path, quality=quality)
+        # explicit quality, or auto-tune to fit in 80 KB
+        path = args[0] if len(args) > 0 else "/tmp/aslan-live.jpg"
+        if len(args) > 1:
+            size = b.save_screenshot(path, quality=int(args[1]))
+        else:
+            size = b.save_screenshot(path, target_kb=80)
         print(f"Screenshot saved: {path} ({size:,} bytes)")
 
     elif cmd == "url":
@@ -62,13 +69,13 @@ try:
         print(b.get_title())
 
     elif cmd == "eval":
-        script = sys.argv[2]
+        script = args[0]
         r = b.evaluate(script)
         print(r)
 
     elif cmd == "scroll":
-        x = float(sys.argv[2]) if len(sys.argv) > 2 else 0
-        y = float(sys.argv[3]) if len(sys.argv) > 3 else 500
+        x = float(args[0]) if len(args) > 0 else 0
+        y = float(args[1]) if len(args) > 1 else 500
         b.scroll(x, y)
         print(f"Scrolled to ({x}, {y})")
 
@@ -77,7 +84,7 @@ try:
         print(json.dumps(r, indent=2))
 
     elif cmd == "wait":
-        secs = float(sys.argv[2]) if len(sys.argv) > 2 else 1
+        secs = float(args[0]) if len(args) > 0 else 1
         time.sleep(secs)
         print(f"Waited {secs}s")
 
@@ -85,5 +92,120 @@ try:
         print(f"Unknown command: {cmd}")
         print("Commands: nav, tree, click, fill, type, key, shot, url, title, eval, scroll, back, wait")
 
-finally:
-    b.close()
+
+# ── daemon ──────────────────────────────────────────────────────────
+
+def serve():
+    """Hold one AslanBrowser and run forwarded commands until SIGTERM."""
+    b = AslanBrowser()
+    if os.path.exists(DAEMON_SOCK):
+        os.unlink(DAEMON_SOCK)
+    srv = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    srv.bind(DAEMON_SOCK)
+    srv.listen()
+
+    def shutdown(*_):
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, shutdown)
+    print(f"ab daemon listening on {DAEMON_SOCK}")
+    try:
+        while True:
+            conn, _ = srv.accept()
+            with conn, conn.makefile("rwb") as f:
+                line = f.readline()
+                if not line:
+                    continue
+                req = json.loads(line)
+                if req["cmd"] == "--stop":
+                    f.write(json.dumps({"output": "ab daemon stopped\n", "error": None}).encode() + b"\n")
+                    f.flush()
+                    return
+                out = io.StringIO()
+                error = None
+                try:
+                    if b is None:
+                        b = AslanBrowser()
+                    try:
+                        with contextlib.redirect_stdout(out):
+                            run(b, req["cmd"], req["args"])
+                    except BrokenPipeError:
+                        # aslan-browser restarted since we connected and the
+                        # request never went out, so running it again is safe
+                        b.close()
+                        b = AslanBrowser()
+                        out = io.StringIO()
+                        with contextlib.redirect_stdout(out):
+                            run(b, req["cmd"], req["args"])
+                except (ConnectionError, OSError) as exc:
+                    # Lost mid-command: report it, reconnect on the next one
+                    error = f"{type(exc).__name__}: {exc}"
+                    if b is not None:
+                        b.close()
+                        b = None
+                except Exception as exc:
+                    error = f"{type(exc).__name__}: {exc}"
+                f.write(json.dumps({"output": out.getvalue(), "error": error}).encode() + b"\n")
+                f.flush()
+    finally:
+        srv.close()
+        if os.path.exists(DAEMON_SOCK):
+            os.unlink(DAEMON_SOCK)
+        if b is not None:
+            b.close()
+
+
+def forward(cmd, args):
+    """Send a command to a running daemon. Returns None if none is reachable."""
+    if not os.path.exists(DAEMON_SOCK):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(DAEMON_SOCK)
+    except OSError:
+        sock.close()
+        return None  # stale socket file
+    with sock, sock.makefile("rwb") as f:
+        f.write(json.dumps({"cmd": cmd, "args": args}).encode() + b"\n")
+        f.flush()
+        line = f.readline()
+    return json.loads(line) if line else None
+
+
+def main():
+    argv = sys.argv[1:]
+    if argv[:1] == ["--daemon"]:
+        serve()
+        return
+    if argv[:1] == ["--stop"]:
+        resp = forward("--stop", [])
+        sys.stdout.write(resp["output"] if resp else "ab daemon not running\n")
+        return
+
+    use_daemon = True
+    if argv[:1] == ["--no-daemon"]:
+        use_daemon = False
+        argv = argv[1:]
+    cmd = argv[0] if argv else "tree"
+    args = argv[1:]
+    if cmd == "shot" and args:
+        args[0] = os.path.abspath(args[0])  # the daemon has its own cwd
+
+    if use_daemon:
+        resp = forward(cmd, args)
+        if resp is not None:
+            sys.stdout.write(resp["output"])
+            if resp["error"]:
+                print(resp["error"], file=sys.stderr)
+                sys.exit(1)
+            return
+
+    b = AslanBrowser()
+    try:
+        run(b, cmd, args)
+    finally:
+        b.close()
+
+
+if __name__ == "__main__":
+    main()
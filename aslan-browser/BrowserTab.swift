@@ -4,6 +4,7 @@
 //
 
 import AppKit
+import ImageIO
 import WebKit
 
 struct NavigationResult {
@@ -263,8 +264,8 @@ class BrowserTab: NSObject, WKNavigationDelegate, WKUIDelegate, NSWindowDelegate
             }
             Task { @MainActor in
                 try? await Task.sleep(nanoseconds: 500_000_000) // 500ms for page to react
-                let base64 = try? await self.screenshot(quality: 60, width: 1440)
-                let _ = recorder.addAction(actionData, screenshotData: base64, tabId: self.tabId)
+                let jpeg = try? await self.screenshot(quality: 60, width: 1440)
+                let _ = recorder.addAction(actionData, screenshotData: jpeg, tabId: self.tabId)
             }
 
         default:
@@ -502,6 +503,30 @@ class BrowserTab: NSObject, WKNavigationDelegate, WKUIDelegate, NSWindowDelegate
         }
     }
 
+    func waitForNode(role: String, nameHint: String?, timeout: Int = 5000) async throws -> [String: Any] {
+        var arguments: [String: Any] = ["role": role, "nameHint": NSNull(), "timeout": timeout]
+        if let nameHint { arguments["nameHint"] = nameHint }
+
+        let result: Any?
+        do {
+            result = try await webView.callAsyncJavaScript(
+                "return await window.__agent.waitForNode(role, nameHint, timeout)",
+                arguments: arguments,
+                contentWorld: .page
+            )
+        } catch {
+            // Only the bridge's own timer rejection is a timeout; anything else
+            // (a throwing extractor, a bad page script) surfaces as-is.
+            let message = (error as NSError).userInfo["WKJavaScriptExceptionMessage"] as? String
+                ?? error.localizedDescription
+            if message.contains("waitForNode timed out") {
+                throw BrowserError.timeout("waitForNode(\(role)) timed out after \(timeout)ms")
+            }
+            throw BrowserError.javaScriptError(message)
+        }
+        return result as? [String: Any] ?? [:]
+    }
+
     // MARK: - Accessibility Tree
 
     func getAccessibilityTree() async throws -> [[String: Any]] {
@@ -590,6 +615,38 @@ class BrowserTab: NSObject, WKNavigationDelegate, WKUIDelegate, NSWindowDelegate
         }
     }
 
+    /// Sets a file on an `<input type="file">` and fires `change`. Returns the file size in bytes.
+    func uploadFile(target: String, base64: String, name: String, mimeType: String) async throws -> Int {
+        let selector = resolveSelector(target)
+        let script = """
+            var input = document.querySelector(selector);
+            if (!input) throw new Error("Element not found: " + selector);
+            var bytes;
+            try {
+                bytes = await (await fetch("data:" + mime + ";base64," + data)).arrayBuffer();
+            } catch (e) {
+                // data: fetches can be blocked by the page's CSP
+                bytes = Uint8Array.from(atob(data), function (c) { return c.charCodeAt(0); });
+            }
+            var file = new File([bytes], name, { type: mime });
+            var dt = new DataTransfer();
+            dt.items.add(file);
+            input.files = dt.files;
+            input.dispatchEvent(new Event("change", { bubbles: true }));
+            return file.size;
+            """
+        do {
+            let result = try await webView.callAsyncJavaScript(
+                script,
+                arguments: ["selector": selector, "data": base64, "name": name, "mime": mimeType],
+                contentWorld: .page
+            )
+            return (result as? NSNumber)?.intValue ?? 0
+        } catch {
+            throw BrowserError.javaScriptError("uploadFile failed: \(error.localizedDescription)")
+        }
+    }
+
     func keypress(key: String, modifiers: [String: Bool]? = nil) async throws {
         let script = """
             var opts = {
@@ -721,7 +778,70 @@ class BrowserTab: NSObject, WKNavigationDelegate, WKUIDelegate, NSWindowDelegate
 
     // MARK: - Screenshot
 
-    func screenshot(quality: Int = 70, width: Int = 1440) async throws -> String {
+    func screenshot(quality: Int = 70, width: Int = 1440) async throws -> Data {
+        let cgImage = try await snapshotImage(width: width)
+        return try await Self.encodeOffMain(cgImage, quality: quality)
+    }
+
+    /// Last quality that met a size target, keyed by "url|width". Shared by all
+    /// tabs so repeated shots of the same page settle on one encode.
+    private static var tunedQuality: [String: Int] = [:]
+    private static var tunedQualityOrder: [String] = []
+    private static let tunedQualityLimit = 64
+
+    /// Takes a screenshot whose JPEG fits in `targetKB`, stepping quality by
+    /// ±10 between encodes (at most `maxTries` encodes). Starts from the last
+    /// quality that fit for this URL and width, or 75.
+    func screenshot(targetKB: Int, width: Int = 1440, maxTries: Int = 3) async throws -> (data: Data, quality: Int) {
+        let cgImage = try await snapshotImage(width: width)
+        let targetBytes = targetKB * 1024
+        let key = "\(webView.url?.absoluteString ?? "")|\(width)"
+
+        var quality = Self.tunedQuality[key] ?? 75
+        var best: (data: Data, quality: Int)?
+        var smallest: (data: Data, quality: Int)?
+        var steppedDown = false
+
+        for _ in 0..<max(maxTries, 1) {
+            let jpegData = try await Self.encodeOffMain(cgImage, quality: quality)
+            if smallest == nil || jpegData.count < smallest!.data.count {
+                smallest = (jpegData, quality)
+            }
+
+            if jpegData.count <= targetBytes {
+                if best == nil || quality > best!.quality {
+                    best = (jpegData, quality)
+                }
+                // Comfortably under target: try one step up for better fidelity
+                guard !steppedDown, jpegData.count < targetBytes * 6 / 10, quality < 95 else { break }
+                quality = min(quality + 10, 95)
+            } else {
+                // Over target: step down, unless this was a step up from one that fit
+                guard quality > 10, best == nil else { break }
+                quality = max(quality - 10, 10)
+                steppedDown = true
+            }
+        }
+
+        guard let result = best ?? smallest else {
+            throw BrowserError.screenshotFailed("Failed to encode JPEG")
+        }
+        if best != nil {
+            Self.rememberQuality(result.quality, for: key)
+        }
+        return result
+    }
+
+    private static func rememberQuality(_ quality: Int, for key: String) {
+        if tunedQuality.updateValue(quality, forKey: key) == nil {
+            tunedQualityOrder.append(key)
+            if tunedQualityOrder.count > tunedQualityLimit {
+                tunedQuality.removeValue(forKey: tunedQualityOrder.removeFirst())
+            }
+        }
+    }
+
+    private func snapshotImage(width: Int) async throws -> CGImage {
         let config = WKSnapshotConfiguration()
         config.snapshotWidth = NSNumber(value: width)
 
@@ -730,22 +850,40 @@ class BrowserTab: NSObject, WKNavigationDelegate, WKUIDelegate, NSWindowDelegate
         guard let cgImage = image.cgImage(forProposedRect: nil, context: nil, hints: nil) else {
             throw BrowserError.screenshotFailed("Failed to create CGImage")
         }
+        return cgImage
+    }
 
-        let bitmap = NSBitmapImageRep(cgImage: cgImage)
+    /// Encodes JPEG off the main thread.
+    private static func encodeOffMain(_ image: CGImage, quality: Int) async throws -> Data {
         let compressionFactor = Double(quality) / 100.0
-
-        // Encode JPEG off main thread
-        let base64 = try await Task.detached {
-            guard let jpegData = bitmap.representation(
-                using: .jpeg,
-                properties: [.compressionFactor: compressionFactor]
-            ) else {
+        return try await Task.detached {
+            guard let jpegData = BrowserTab.encodeJPEG(image, quality: compressionFactor) else {
                 throw BrowserError.screenshotFailed("Failed to encode JPEG")
             }
-            return jpegData.base64EncodedString()
+            return jpegData
         }.value
+    }
 
-        return base64
+    /// Encodes a CGImage as JPEG with ImageIO directly. This skips the
+    /// NSBitmapImageRep wrapper (and the copy it makes of the snapshot's
+    /// pixels) and goes straight to the system's hardware-tuned JPEG encoder.
+    nonisolated static func encodeJPEG(_ image: CGImage, quality: Double) -> Data? {
+        let data = NSMutableData()
+        guard let destination = CGImageDestinationCreateWithData(
+            data as CFMutableData, "public.jpeg" as CFString, 1, nil
+        ) else {
+            return nil
+        }
+        // Baseline (non-progressive) JPEG: one scan, cheapest to encode and decode
+        let options = [
+            kCGImageDestinationLossyCompressionQuality: quality,
+            kCGImagePropertyJFIFDictionary: [kCGImagePropertyJFIFIsProgressive: false]
+        ] as CFDictionary
+        CGImageDestinationAddImage(destination, image, options)
+        guard CGImageDestinationFinalize(destination) else {
+            return nil
+        }
+        return data as Data
     }
 
     // MARK: - Focus URL Bar
@@ -1012,8 +1150,8 @@ class BrowserTab: NSObject, WKNavigationDelegate, WKUIDelegate, NSWindowDelegate
                 ]
                 Task { @MainActor in
                     try? await Task.sleep(nanoseconds: 500_000_000) // 500ms for page to settle
-                    let base64 = try? await self.screenshot(quality: 60, width: 1440)
-                    let _ = recorder.addAction(navAction, screenshotData: base64, tabId: self.tabId)
+                    let jpeg = try? await self.screenshot(quality: 60, width: 1440)
+                    let _ = recorder.addAction(navAction, screenshotData: jpeg, tabId: self.tabId)
                 }
                 // Re-inject learn listeners (navigation clears JS state)
                 self.startLearnMode()
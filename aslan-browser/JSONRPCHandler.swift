@@ -12,15 +12,17 @@ final class JSONRPCHandler: ChannelInboundHandler {
 
     private let router: MethodRouter
     private let server: SocketServer
+    private let framing: FramingState
 
     // Per-connection session tracking: sessions created by this client
     // are auto-destroyed when the connection drops (crash, disconnect).
     private let sessionLock = NSLock()
     private var ownedSessions: Set<String> = []
 
-    init(router: MethodRouter, server: SocketServer) {
+    init(router: MethodRouter, server: SocketServer, framing: FramingState) {
         self.router = router
         self.server = server
+        self.framing = framing
     }
 
     func channelActive(context: ChannelHandlerContext) {
@@ -93,6 +95,12 @@ final class JSONRPCHandler: ChannelInboundHandler {
             return
         }
 
+        // Framing negotiation is connection-level and handled on the event loop
+        if request.method == "protocol.negotiate" {
+            handleNegotiate(context: context, request: request)
+            return
+        }
+
         // Dispatch to router on MainActor
         let router = self.router
         let method = request.method
@@ -151,6 +159,20 @@ final class JSONRPCHandler: ChannelInboundHandler {
         context.close(promise: nil)
     }
 
+    // MARK: - Protocol Negotiation
+
+    /// Switches this connection's framing. The response is written in the
+    /// current framing; everything after it uses the negotiated one.
+    /// Unknown framings fall back to NDJSON, which is reported in the result.
+    private func handleNegotiate(context: ChannelHandlerContext, request: RPCRequest) {
+        let requested = request.params?["framing"] as? String
+        let mode = requested.flatMap(Framing.init(rawValue:)) ?? .ndjson
+        let response = RPCResponse(id: request.id, result: ["framing": mode.rawValue])
+        guard let data = try? response.serialize() else { return }
+        writeData(context: context, data: data)
+        framing.mode = mode
+    }
+
     // MARK: - Helpers
 
     private func writeError(context: ChannelHandlerContext, id: Int?, error: RPCError) {
@@ -159,9 +181,8 @@ final class JSONRPCHandler: ChannelInboundHandler {
     }
 
     private func writeData(context: ChannelHandlerContext, data: Data) {
-        var buffer = context.channel.allocator.buffer(capacity: data.count + 1)
+        var buffer = context.channel.allocator.buffer(capacity: data.count)
         buffer.writeBytes(data)
-        buffer.writeString("\n")
         context.writeAndFlush(wrapOutboundOut(buffer), promise: nil)
     }
 
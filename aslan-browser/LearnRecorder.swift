@@ -71,7 +71,7 @@ class LearnRecorder {
     // MARK: - Add Action
 
     @discardableResult
-    func addAction(_ action: [String: Any], screenshotData: String?, tabId: String) -> Int {
+    func addAction(_ action: [String: Any], screenshotData: Data?, tabId: String) -> Int {
         guard state == .recording else { return 0 }
 
         let seq = nextSeq
@@ -80,10 +80,10 @@ class LearnRecorder {
         entry["timestamp"] = Date().timeIntervalSince1970 * 1000
         entry["tabId"] = tabId
 
-        if let base64 = screenshotData, let dir = screenshotDir {
+        if let jpeg = screenshotData, let dir = screenshotDir {
             let path = "\(dir)/step-\(String(format: "%03d", seq)).jpg"
             entry["screenshot"] = path
-            writeScreenshot(base64: base64, to: path)
+            writeScreenshot(jpeg, to: path)
         }
 
         actions.append(entry)
@@ -122,10 +122,9 @@ class LearnRecorder {
 
     // MARK: - Private
 
-    private func writeScreenshot(base64: String, to path: String) {
+    private func writeScreenshot(_ jpeg: Data, to path: String) {
         Task.detached {
-            guard let data = Data(base64Encoded: base64) else { return }
-            try? data.write(to: URL(fileURLWithPath: path))
+            try? jpeg.write(to: URL(fileURLWithPath: path))
         }
     }
 }
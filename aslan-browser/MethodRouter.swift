@@ -4,6 +4,7 @@
 //
 
 import Foundation
+import UniformTypeIdentifiers
 import WebKit
 
 @MainActor
@@ -29,6 +30,8 @@ class MethodRouter {
             return try await handleGetURL(params)
         case "waitForSelector":
             return try await handleWaitForSelector(params)
+        case "waitForNode":
+            return try await handleWaitForNode(params)
         case "getAccessibilityTree":
             return try await handleGetAccessibilityTree(params)
         case "click":
@@ -37,6 +40,8 @@ class MethodRouter {
             return try await handleFill(params)
         case "select":
             return try await handleSelect(params)
+        case "uploadFile":
+            return try await handleUploadFile(params)
         case "keypress":
             return try await handleKeypress(params)
         case "scroll":
@@ -55,6 +60,8 @@ class MethodRouter {
             return try await handleTabCreate(params)
         case "tab.close":
             return try handleTabClose(params)
+        case "tab.exists":
+            return try handleTabExists(params)
         case "tab.list":
             return handleTabList(params)
         case "session.create":
@@ -63,6 +70,8 @@ class MethodRouter {
             return try handleSessionDestroy(params)
         case "batch":
             return try await handleBatch(params)
+        case "status":
+            return handleStatus(params)
         case "learn.start":
             return try handleLearnStart(params)
         case "learn.stop":
@@ -122,9 +131,41 @@ class MethodRouter {
 
         let quality = params?["quality"] as? Int ?? 70
         let width = params?["width"] as? Int ?? 1440
+        let path = params?["path"] as? String
 
-        let base64 = try await tab.screenshot(quality: quality, width: width)
-        return ["data": base64]
+        if let path, !path.hasPrefix("/") {
+            throw RPCError.invalidParams("path must be absolute")
+        }
+
+        var result: [String: Any] = [:]
+        let jpegData: Data
+        if let targetKB = params?["targetKB"] as? Int {
+            guard targetKB > 0 else {
+                throw RPCError.invalidParams("targetKB must be positive")
+            }
+            let maxTries = params?["maxTries"] as? Int ?? 3
+            let shot = try await tab.screenshot(targetKB: targetKB, width: width, maxTries: maxTries)
+            jpegData = shot.data
+            result["quality"] = shot.quality
+        } else {
+            jpegData = try await tab.screenshot(quality: quality, width: width)
+        }
+
+        // With a path, write the file here and skip shipping base64 over the socket
+        if let path {
+            try await Task.detached {
+                do {
+                    try jpegData.write(to: URL(fileURLWithPath: path), options: .atomic)
+                } catch {
+                    throw BrowserError.screenshotFailed("Failed to write \(path): \(error.localizedDescription)")
+                }
+            }.value
+            result["path"] = path
+            result["size"] = jpegData.count
+        } else {
+            result["data"] = jpegData.base64EncodedString()
+        }
+        return result
     }
 
     private func handleGetTitle(_ params: [String: Any]?) async throws -> [String: Any] {
@@ -168,6 +209,34 @@ class MethodRouter {
         return ["ok": true]
     }
 
+    private func handleUploadFile(_ params: [String: Any]?) async throws -> [String: Any] {
+        let tab = try resolveTab(params)
+
+        guard let path = params?["path"] as? String else {
+            throw RPCError.invalidParams("Missing required param: path")
+        }
+        guard path.hasPrefix("/") else {
+            throw RPCError.invalidParams("path must be absolute")
+        }
+        let selector = params?["selector"] as? String ?? "input[type=\"file\"]"
+        let url = URL(fileURLWithPath: path)
+        let name = params?["name"] as? String ?? url.lastPathComponent
+        let mimeType = params?["mimeType"] as? String
+            ?? UTType(filenameExtension: url.pathExtension)?.preferredMIMEType
+            ?? "application/octet-stream"
+
+        // Read and encode off the main actor; the client only sends the path
+        let encoded = try await Task.detached {
+            do {
+                return try Data(contentsOf: url).base64EncodedString()
+            } catch {
+                throw RPCError.invalidParams("Cannot read \(path): \(error.localizedDescription)")
+            }
+        }.value
+        let size = try await tab.uploadFile(target: selector, base64: encoded, name: name, mimeType: mimeType)
+        return ["ok": true, "size": size]
+    }
+
     private func handleSelect(_ params: [String: Any]?) async throws -> [String: Any] {
         let tab = try resolveTab(params)
 
@@ -215,6 +284,20 @@ class MethodRouter {
         return ["found": true]
     }
 
+    private func handleWaitForNode(_ params: [String: Any]?) async throws -> [String: Any] {
+        let tab = try resolveTab(params)
+
+        guard let role = params?["role"] as? String else {
+            throw RPCError.invalidParams("Missing required param: role")
+        }
+
+        let nameHint = params?["nameHint"] as? String
+        let timeout = params?["timeout"] as? Int ?? 5000
+
+        let node = try await tab.waitForNode(role: role, nameHint: nameHint, timeout: timeout)
+        return ["node": node]
+    }
+
     // MARK: - Navigation History
 
     private func handleGoBack(_ params: [String: Any]?) async throws -> [String: Any] {
@@ -291,12 +374,28 @@ class MethodRouter {
         return ["ok": true]
     }
 
+    private func handleTabExists(_ params: [String: Any]?) throws -> [String: Any] {
+        guard let tabId = params?["tabId"] as? String else {
+            throw RPCError.invalidParams("Missing required param: tabId")
+        }
+        return ["exists": (try? tabManager.getTab(id: tabId)) != nil]
+    }
+
     private func handleTabList(_ params: [String: Any]?) -> [String: Any] {
         let sessionId = params?["sessionId"] as? String
         let tabs = tabManager.listTabs(sessionId: sessionId).map { $0.dict }
         return ["tabs": tabs]
     }
 
+    private func handleStatus(_ params: [String: Any]?) -> [String: Any] {
+        let tabs = tabManager.listTabs()
+        var result: [String: Any] = ["tabCount": tabs.count]
+        if params?["includeTabs"] as? Bool == true {
+            result["tabs"] = tabs.map { $0.dict }
+        }
+        return result
+    }
+
     // MARK: - Session Methods
 
     private func handleSessionCreate(_ params: [String: Any]?) -> [String: Any] {
@@ -348,30 +447,20 @@ class MethodRouter {
             throw RPCError.invalidParams("Missing required param: requests (array)")
         }
 
+        // Sequential batches run in order on the main actor, so dependent steps
+        // (click then fill) need no client-side sleeps or extra round-trips.
+        if params?["sequential"] as? Bool == true {
+            var responses = [[String: Any]]()
+            for req in requests {
+                responses.append(await runBatchItem(req))
+            }
+            return ["responses": responses]
+        }
+
         let responses = await withTaskGroup(of: (Int, [String: Any]).self) { group in
             for (index, req) in requests.enumerated() {
                 group.addTask { @MainActor in
-                    guard let method = req["method"] as? String else {
-                        return (index, ["error": ["code": -32600, "message": "Missing method in batch request"]])
-                    }
-
-                    // Reject nested batch
-                    if method == "batch" {
-                        return (index, ["error": ["code": -32600, "message": "Nested batch not allowed"]])
-                    }
-
-                    let subParams = req["params"] as? [String: Any]
-                    do {
-                        let result = try await self.dispatch(method, params: subParams)
-                        return (index, ["result": result])
-                    } catch let err as RPCError {
-                        return (index, ["error": ["code": err.code, "message": err.message]])
-                    } catch let err as BrowserError {
-                        let rpcErr = err.rpcError
-                        return (index, ["error": ["code": rpcErr.code, "message": rpcErr.message]])
-                    } catch {
-                        return (index, ["error": ["code": -32603, "message": error.localizedDescription]])
-                    }
+                    (index, await self.runBatchItem(req))
                 }
             }
 
@@ -384,4 +473,28 @@ class MethodRouter {
 
         return ["responses": responses]
     }
+
+    private func runBatchItem(_ req: [String: Any]) async -> [String: Any] {
+        guard let method = req["method"] as? String else {
+            return ["error": ["code": -32600, "message": "Missing method in batch request"]]
+        }
+
+        // Reject nested batch
+        if method == "batch" {
+            return ["error": ["code": -32600, "message": "Nested batch not allowed"]]
+        }
+
+        let subParams = req["params"] as? [String: Any]
+        do {
+            let result = try await dispatch(method, params: subParams)
+            return ["result": result]
+        } catch let err as RPCError {
+            return ["error": ["code": err.code, "message": err.message]]
+        } catch let err as BrowserError {
+            let rpcErr = err.rpcError
+            return ["error": ["code": rpcErr.code, "message": rpcErr.message]]
+        } catch {
+            return ["error": ["code": -32603, "message": error.localizedDescription]]
+        }
+    }
 }
@@ -30,6 +30,32 @@ enum ScriptBridge {
                 }
             };
 
+            // --- Idle callbacks ---
+
+            (function() {
+                var waiters = [];
+
+                window.__agent._isIdle = function() {
+                    return window.__agent._networkPending() === 0 && window.__agent._isDOMStable();
+                };
+
+                // Run cb once the network is idle and the DOM is stable (now, if already so)
+                window.__agent.onIdle = function(cb) {
+                    if (window.__agent._isIdle()) {
+                        cb();
+                        return;
+                    }
+                    waiters.push(cb);
+                };
+
+                window.__agent._checkIdle = function() {
+                    if (waiters.length === 0 || !window.__agent._isIdle()) return;
+                    var ready = waiters;
+                    waiters = [];
+                    ready.forEach(function(cb) { cb(); });
+                };
+            })();
+
             // --- Network tracking ---
 
             (function() {
@@ -49,6 +75,7 @@ enum ScriptBridge {
                     if (pending === 0 && !wasIdle) {
                         wasIdle = true;
                         window.__agent.post("networkIdle");
+                        window.__agent._checkIdle();
                     }
                 }
 
@@ -104,6 +131,9 @@ enum ScriptBridge {
                 var timer = null;
                 var domQuietMs = 500;
                 var observer = null;
+                var stable = false;
+
+                window.__agent._isDOMStable = function() { return stable; };
 
                 window.__agent.startDOMObserver = function(quietMs) {
                     if (quietMs !== undefined) domQuietMs = quietMs;
@@ -113,9 +143,12 @@ enum ScriptBridge {
                     }
 
                     function resetTimer() {
+                        stable = false;
                         if (timer) clearTimeout(timer);
                         timer = setTimeout(function() {
+                            stable = true;
                             window.__agent.post("domStable");
+                            window.__agent._checkIdle();
                         }, domQuietMs);
                     }
 
@@ -435,6 +468,78 @@ enum ScriptBridge {
                     }, timeoutMs);
                 });
             };
+
+            // --- waitForNode ---
+
+            // Resolves with the first a11y node matching role (and, if given,
+            // a case-insensitive substring of its name or value). Re-checks on
+            // DOM mutations, coalesced so a burst of changes extracts once.
+            window.__agent.waitForNode = function(role, nameHint, timeoutMs) {
+                timeoutMs = timeoutMs || 5000;
+                var hint = nameHint ? String(nameHint).toLowerCase() : null;
+
+                function find() {
+                    var nodes = window.__agent.extractA11yTree();
+                    for (var i = 0; i < nodes.length; i++) {
+                        var n = nodes[i];
+                        if (n.role !== role) continue;
+                        if (!hint) return n;
+                        var text = ((n.name || "") + " " + (n.value || "")).toLowerCase();
+                        if (text.indexOf(hint) !== -1) return n;
+                    }
+                    return null;
+                }
+
+                return new Promise(function(resolve, reject) {
+                    var node = find();
+                    if (node) {
+                        resolve(node);
+                        return;
+                    }
+
+                    var observer = null;
+                    var timer = null;
+                    var pending = null;
+
+                    function cleanup() {
+                        if (observer) observer.disconnect();
+                        if (timer) clearTimeout(timer);
+                        if (pending) clearTimeout(pending);
+                    }
+
+                    observer = new MutationObserver(function() {
+                        if (pending) return;
+                        pending = setTimeout(function() {
+                            pending = null;
+                            var node;
+                            try {
+                                node = find();
+                            } catch (e) {
+                                // Fail now rather than waiting out the timer.
+                                cleanup();
+                                reject(e);
+                                return;
+                            }
+                            if (node) {
+                                cleanup();
+                                resolve(node);
+                            }
+                        }, 50);
+                    });
+
+                    observer.observe(document.documentElement, {
+                        childList: true,
+                        subtree: true,
+                        attributes: true,
+                        attributeFilter: ["class", "style", "hidden", "aria-hidden", "aria-label", "disabled"]
+                    });
+
+                    timer = setTimeout(function() {
+                        cleanup();
+                        reject(new Error("waitForNode timed out after " + timeoutMs + "ms: " + role));
+                    }, timeoutMs);
+                });
+            };
         })();
         """
     }
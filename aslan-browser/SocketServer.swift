@@ -7,13 +7,52 @@ import Foundation
 import NIOCore
 import NIOPosix
 
-// MARK: - Line Decoder
+// MARK: - Framing
+
+/// Wire framing for a single connection. Every connection starts as NDJSON;
+/// a client may switch to 4-byte big-endian length-prefixed frames by calling
+/// `protocol.negotiate` with `{"framing": "len32"}`.
+enum Framing: String {
+    case ndjson
+    case len32
+}
+
+/// Per-connection framing mode shared by the decoder, encoder and handler.
+/// Only read or written on the channel's event loop.
+final class FramingState {
+    var mode: Framing = .ndjson
+}
+
+enum FramingError: Error {
+    case frameTooLarge(Int)
+}
+
+// MARK: - Frame Decoder
 
-/// Splits incoming bytes on newline boundaries for NDJSON framing.
-final class LineBasedFrameDecoder: ByteToMessageDecoder {
+/// Splits incoming bytes into messages using the connection's current framing:
+/// newline boundaries for NDJSON, or a 4-byte length header for len32.
+final class MessageFrameDecoder: ByteToMessageDecoder {
     typealias InboundOut = ByteBuffer
 
+    /// Upper bound on a single length-prefixed frame (64 MiB).
+    static let maxFrameLength = 64 * 1024 * 1024
+
+    private let state: FramingState
+
+    init(state: FramingState) {
+        self.state = state
+    }
+
     func decode(context: ChannelHandlerContext, buffer: inout ByteBuffer) throws -> DecodingState {
+        switch state.mode {
+        case .ndjson:
+            return decodeLine(context: context, buffer: &buffer)
+        case .len32:
+            return try decodeFrame(context: context, buffer: &buffer)
+        }
+    }
+
+    private func decodeLine(context: ChannelHandlerContext, buffer: inout ByteBuffer) -> DecodingState {
         guard let nlIndex = buffer.readableBytesView.firstIndex(of: UInt8(ascii: "\n")) else {
             return .needMoreData
         }
@@ -30,6 +69,54 @@ final class LineBasedFrameDecoder: ByteToMessageDecoder {
         context.fireChannelRead(wrapInboundOut(lineBuffer))
         return .continue
     }
+
+    private func decodeFrame(context: ChannelHandlerContext, buffer: inout ByteBuffer) throws -> DecodingState {
+        guard let header = buffer.getInteger(at: buffer.readerIndex, endianness: .big, as: UInt32.self) else {
+            return .needMoreData
+        }
+
+        let length = Int(header)
+        guard length <= Self.maxFrameLength else {
+            throw FramingError.frameTooLarge(length)
+        }
+        guard buffer.readableBytes >= 4 + length else {
+            return .needMoreData
+        }
+
+        buffer.moveReaderIndex(forwardBy: 4)
+        let frame = buffer.readSlice(length: length)!
+        context.fireChannelRead(wrapInboundOut(frame))
+        return .continue
+    }
+}
+
+// MARK: - Frame Encoder
+
+/// Frames outbound messages to match the connection's current framing.
+/// Handlers write bare JSON bodies; this adds the trailing newline or the
+/// length header.
+final class MessageFrameEncoder: MessageToByteEncoder {
+    typealias OutboundIn = ByteBuffer
+
+    private let state: FramingState
+
+    init(state: FramingState) {
+        self.state = state
+    }
+
+    func encode(data: ByteBuffer, out: inout ByteBuffer) throws {
+        var body = data
+        switch state.mode {
+        case .ndjson:
+            out.reserveCapacity(out.writerIndex + body.readableBytes + 1)
+            out.writeBuffer(&body)
+            out.writeString("\n")
+        case .len32:
+            out.reserveCapacity(out.writerIndex + body.readableBytes + 4)
+            out.writeInteger(UInt32(body.readableBytes), endianness: .big)
+            out.writeBuffer(&body)
+        }
+    }
 }
 
 // MARK: - Socket Server
@@ -78,9 +165,8 @@ class SocketServer {
         clientLock.unlock()
 
         for ch in channels {
-            var buffer = ch.allocator.buffer(capacity: data.count + 1)
+            var buffer = ch.allocator.buffer(capacity: data.count)
             buffer.writeBytes(data)
-            buffer.writeString("\n")
             ch.writeAndFlush(buffer).whenFailure { [weak self] _ in
                 self?.removeClient(ch)
             }
@@ -94,9 +180,11 @@ class SocketServer {
             .serverChannelOption(.backlog, value: 256)
             .childChannelInitializer { [router, weak self] channel in
                 guard let self else { return channel.eventLoop.makeSucceededVoidFuture() }
+                let framing = FramingState()
                 return channel.pipeline.addHandlers([
-                    ByteToMessageHandler(LineBasedFrameDecoder()),
-                    JSONRPCHandler(router: router, server: self)
+                    ByteToMessageHandler(MessageFrameDecoder(state: framing)),
+                    MessageToByteHandler(MessageFrameEncoder(state: framing)),
+                    JSONRPCHandler(router: router, server: self, framing: framing)
                 ])
             }
             .childChannelOption(.socketOption(.so_reuseaddr), value: 1)
@@ -21,8 +21,15 @@ SOCKET_PATH = "/tmp/aslan-browser.sock"
 COMPLEX_PAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "complex_page.html")
 
 
-def bench(name: str, fn, iterations: int, warmup: int = 5) -> dict:
-    """Run a benchmark and return stats."""
+def bench(name: str, fn, iterations: int, warmup: int = 200) -> dict:
+    """Run a benchmark and return stats.
+
+    The first ``warmup`` calls are discarded. Mean and stdev are computed over
+    samples inside Tukey's fences (Q1 - 1.5·IQR, Q3 + 1.5·IQR) so a single GC
+    pause or scheduler hiccup doesn't skew them; outliers are counted and
+    averaged separately. Median, p95, min and max use all samples, with
+    percentiles linearly interpolated between neighbours.
+    """
     # Warmup
     for _ in range(warmup):
         fn()
@@ -34,18 +41,38 @@ def bench(name: str, fn, iterations: int, warmup: int = 5) -> dict:
         elapsed = (time.perf_counter() - start) * 1000  # ms
         times.append(elapsed)
 
+    # Sort once; every order statistic below reads from it
+    ordered = sorted(times)
+    clean, outliers = ordered, []
+    if len(ordered) >= 4:
+        q1, q3 = _percentile(ordered, 25), _percentile(ordered, 75)
+        iqr = q3 - q1
+        lo, hi = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+        clean = [t for t in ordered if lo <= t <= hi]
+        outliers = [t for t in ordered if not lo <= t <= hi]
+
     return {
         "name": name,
         "iterations": iterations,
-        "mean_ms": statistics.mean(times),
-        "median_ms": statistics.median(times),
-        "p95_ms": sorted(times)[int(len(times) * 0.95)],
-        "min_ms": min(times),
-        "max_ms": max(times),
-        "stdev_ms": statistics.stdev(times) if len(times) > 1 else 0,
+        "mean_ms": statistics.fmean(clean),
+        "median_ms": _percentile(ordered, 50),
+        "p95_ms": _percentile(ordered, 95),
+        "min_ms": ordered[0],
+        "max_ms": ordered[-1],
+        "stdev_ms": statistics.stdev(clean) if len(clean) > 1 else 0,
+        "outlier_count": len(outliers),
+        "outlier_mean_ms": statistics.fmean(outliers) if outliers else 0,
     }
 
 
+def _percentile(ordered: list, pct: float) -> float:
+    """Linearly interpolated percentile of an already-sorted list."""
+    pos = (len(ordered) - 1) * pct / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
 def main():
     print(f"Connecting to {SOCKET_PATH}...")
     browser = AslanBrowser(SOCKET_PATH)
@@ -91,16 +118,18 @@ def main():
     print(f"  median: {result['median_ms']:.2f}ms (target: <50ms {target_met})")
 
     # ── Summary table ────────────────────────────────────────────────
-    print("\n" + "=" * 90)
-    print(f"{'Benchmark':<30} {'Iters':>6} {'Mean':>8} {'Median':>8} {'P95':>8} {'Min':>8} {'Max':>8}")
-    print("-" * 90)
+    print("\n" + "=" * 97)
+    print(f"{'Benchmark':<30} {'Iters':>6} {'Mean':>8} {'Median':>8} {'P95':>8} {'Min':>8} {'Max':>8} {'Out':>5}")
+    print("-" * 97)
     for r in results:
         print(
             f"{r['name']:<30} {r['iterations']:>6} "
             f"{r['mean_ms']:>7.2f}ms {r['median_ms']:>7.2f}ms "
-            f"{r['p95_ms']:>7.2f}ms {r['min_ms']:>7.2f}ms {r['max_ms']:>7.2f}ms"
+            f"{r['p95_ms']:>7.2f}ms {r['min_ms']:>7.2f}ms {r['max_ms']:>7.2f}ms "
+            f"{r['outlier_count']:>5}"
         )
-    print("=" * 90)
+    print("=" * 97)
+    print("Mean excludes outliers outside Tukey's fences (Out = outlier count).")
 
     # ── Targets ──────────────────────────────────────────────────────
     print("\nTargets (from PRD):")
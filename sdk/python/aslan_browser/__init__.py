@@ -1,7 +1,44 @@
 """aslan-browser Python SDK — control a native macOS browser from Python."""
 
-from aslan_browser.client import AslanBrowser, AslanBrowserError
-from aslan_browser.async_client import AsyncAslanBrowser
+from __future__ import annotations
 
-__all__ = ["AslanBrowser", "AsyncAslanBrowser", "AslanBrowserError"]
-__version__ = "0.5.0"
+import importlib
+from typing import TYPE_CHECKING, Any
+
+from aslan_browser._version import __version__
+
+if TYPE_CHECKING:
+    from aslan_browser.async_client import AsyncAslanBrowser
+    from aslan_browser.client import AslanBrowser, AslanBrowserError, get_shared_client
+    from aslan_browser.tree import TreeIndex
+
+__all__ = [
+    "AslanBrowser",
+    "AsyncAslanBrowser",
+    "AslanBrowserError",
+    "TreeIndex",
+    "get_shared_client",
+]
+
+# Public names are imported on first access, so light entry points such as
+# `aslan --version` don't pay for the socket/asyncio imports.
+_LAZY = {
+    "AslanBrowser": "aslan_browser.client",
+    "AslanBrowserError": "aslan_browser.client",
+    "get_shared_client": "aslan_browser.client",
+    "AsyncAslanBrowser": "aslan_browser.async_client",
+    "TreeIndex": "aslan_browser.tree",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module 'aslan_browser' has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -3,17 +3,188 @@
 from __future__ import annotations
 
 import asyncio
-import base64
-import json
+import inspect
+import itertools
 import os
+import socket
 from typing import Any, Callable, Optional
 
-from aslan_browser.client import AslanBrowserError
+from aslan_browser.client import (
+    AslanBrowserError,
+    _LEN_PREFIX,
+    _SOCK_BUFSIZE,
+    _b64decode,
+    _dumps,
+    _loads_view,
+    _request_prefix,
+    _screenshot_params,
+    _write_b64_file,
+)
+from aslan_browser.tree import TreeIndex
 
 
 _DEFAULT_SOCKET = "/tmp/aslan-browser.sock"
 _RETRY_DELAYS = [0.1, 0.5, 1.0]
 
+# Largest single message the reader accepts.  asyncio's default (64 KiB) is
+# smaller than a typical accessibility tree or screenshot on NDJSON servers.
+_READ_LIMIT = 64 * 1024 * 1024
+_RECV_CHUNK = 64 * 1024
+# Params at least this large (big evaluate scripts, uploads) are written as
+# separate pieces instead of being copied into one request buffer first.
+_SCATTER_MIN = 32 * 1024
+
+# auto_batch: most requests folded into one batch frame, and the methods that
+# must travel alone (connection-level, or tracked per connection by the server).
+_AUTO_BATCH_MAX = 32
+_UNBATCHED = frozenset({"batch", "protocol.negotiate", "session.create", "session.destroy"})
+
+_eager_task_factory = getattr(asyncio, "eager_task_factory", None)  # Python 3.12+
+
+
+async def _gather_eager(*coros: Any) -> list[Any]:
+    """asyncio.gather() whose tasks start eagerly where supported.
+
+    Each coroutine runs up to its first real suspension as its task is
+    created, so every request is written before the first await instead of
+    one loop iteration later.
+    """
+    if _eager_task_factory is None:
+        return await asyncio.gather(*coros)
+    loop = asyncio.get_running_loop()
+    return await asyncio.gather(*(_eager_task_factory(loop, c) for c in coros))
+
+
+async def _swallow(coro: Any) -> None:
+    """Await an event handler, dropping its errors as sync handlers' are."""
+    try:
+        await coro
+    except Exception:
+        pass
+
+
+class _ClientProtocol(asyncio.BufferedProtocol):
+    """Connection protocol for AsyncAslanBrowser.
+
+    The transport receives straight into one reusable buffer (recv_into via
+    get_buffer/buffer_updated), and complete messages are split out and
+    handed to the client from the same callback — no StreamReader, no
+    per-line readline() copy, no reader task.
+    """
+
+    def __init__(self, on_message: Callable[[dict], None], on_lost: Callable[[], None]):
+        self._on_message = on_message
+        self._on_lost = on_lost
+        self._buf = bytearray(_RECV_CHUNK)
+        self._start = 0  # first unconsumed byte
+        self._end = 0  # one past the last received byte
+        self._scan = 0  # where the next newline search resumes (NDJSON)
+        self._need = 0  # size of the len32 frame being received
+        self.framing = "ndjson"
+        # Request id of a pending protocol.negotiate; its reply switches the
+        # read framing before any byte after it is parsed.
+        self.upgrade_id: Optional[int] = None
+        self.transport: Optional[asyncio.Transport] = None
+        self.lost = False
+        self.paused = False
+        self._drain_waiter: Optional[asyncio.Future] = None
+        self._closed = asyncio.get_running_loop().create_future()
+
+    # ── receiving ──
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        buf = self._buf
+        start, end = self._start, self._end
+        if start == end:
+            start = end = self._start = self._end = self._scan = 0
+        if len(buf) - end < _RECV_CHUNK // 4:
+            if start:
+                # Move the partial message to the front
+                n = end - start
+                buf[:n] = buf[start:end]
+                self._scan -= start
+                start, end = self._start, self._end = 0, n
+            want = max(self._need, end + _RECV_CHUNK // 4)
+            if want > len(buf):
+                buf.extend(bytes(max(want, 2 * len(buf)) - len(buf)))
+        return memoryview(buf)[end:]
+
+    def buffer_updated(self, nbytes: int) -> None:
+        self._end += nbytes
+        buf, start, end = self._buf, self._start, self._end
+        while start < end:
+            if self.framing == "len32":
+                if end - start < 4:
+                    break
+                stop = start + 4 + _LEN_PREFIX.unpack_from(buf, start)[0]
+                if stop > end:
+                    self._need = stop - start
+                    break
+                first, last = start + 4, stop
+            else:
+                nl = buf.find(b"\n", max(start, self._scan), end)
+                if nl < 0:
+                    self._scan = end
+                    break
+                first, last, stop = start, nl, nl + 1
+            start = self._start = stop
+            self._need = 0
+            self._dispatch(buf, first, last)
+        if end - start > _READ_LIMIT or self._need > _READ_LIMIT:
+            self.transport.close()  # runaway message: fail the connection
+
+    def _dispatch(self, buf: bytearray, first: int, last: int) -> None:
+        # Parsed straight from the receive buffer (no slice copy with
+        # orjson); the view is released before the buffer can be resized.
+        try:
+            with memoryview(buf)[first:last] as view:
+                msg = _loads_view(view)
+        except ValueError:
+            return
+        if self.upgrade_id is not None and msg.get("id") == self.upgrade_id:
+            self.upgrade_id = None
+            result = msg.get("result")  # old binaries answer with an error
+            if result and result.get("framing") == "len32":
+                self.framing = "len32"
+        self._on_message(msg)
+
+    # ── connection state and flow control ──
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport  # type: ignore[assignment]
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self.lost = True
+        self._on_lost()
+        if not self._closed.done():
+            self._closed.set_result(None)
+        waiter = self._drain_waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_exception(ConnectionError("Connection lost."))
+
+    def pause_writing(self) -> None:
+        self.paused = True
+
+    def resume_writing(self) -> None:
+        self.paused = False
+        waiter = self._drain_waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    async def drain(self) -> None:
+        """Wait while the transport is over its write high-water mark."""
+        if self.lost:
+            raise ConnectionError("Connection lost.")
+        if self.paused:
+            waiter = self._drain_waiter
+            if waiter is None or waiter.done():
+                waiter = self._drain_waiter = asyncio.get_running_loop().create_future()
+            # Shared by every paused writer; one cancelled caller mustn't cancel it
+            await asyncio.shield(waiter)
+
+    async def wait_closed(self) -> None:
+        await self._closed
+
 
 class AsyncAslanBrowser:
     """Async client for aslan-browser.
@@ -22,6 +193,12 @@ class AsyncAslanBrowser:
     tabs created by this client) on close.  Pass ``auto_session=False`` to
     opt out and manage sessions manually.
 
+    With ``auto_batch=True``, calls issued in the same event-loop tick (for
+    example under ``asyncio.gather``) go out as one ``batch`` request, up to
+    32 at a time.  Each call still gets its own result or error, but a
+    batch answers only when all of its calls finish, so leave this off when
+    fast calls run alongside slow ones such as navigations.
+
     Usage::
 
         from aslan_browser import AsyncAslanBrowser
@@ -33,14 +210,25 @@ class AsyncAslanBrowser:
         # all tabs created by this client are auto-closed here
     """
 
-    def __init__(self, socket_path: str = _DEFAULT_SOCKET, *, auto_session: bool = True):
+    def __init__(
+        self,
+        socket_path: str = _DEFAULT_SOCKET,
+        *,
+        auto_session: bool = True,
+        auto_batch: bool = False,
+    ):
         self._socket_path = socket_path
-        self._reader: Optional[asyncio.StreamReader] = None
-        self._writer: Optional[asyncio.StreamWriter] = None
-        self._next_id = 0
+        self._transport: Optional[asyncio.Transport] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._protocol: Optional[_ClientProtocol] = None
+        self._framing = "ndjson"
+        self._ids = itertools.count(1)
         self._pending: dict[int, asyncio.Future] = {}
-        self._read_task: Optional[asyncio.Task] = None
+        self._auto_batch = auto_batch
+        self._queued: list[tuple[str, Optional[dict], asyncio.Future]] = []
         self._on_event: Optional[Callable[[dict], Any]] = None
+        self._on_event_is_coro = False
+        self._event_tasks: set[asyncio.Task] = set()
         self._auto_session = auto_session
         self._session_id: Optional[str] = None
         self._owned_tabs: list[str] = []
@@ -59,20 +247,29 @@ class AsyncAslanBrowser:
 
     async def connect(self) -> None:
         """Connect to the aslan-browser Unix socket with retry."""
-        if self._reader is not None:
+        if self._transport is not None:
             return
 
         last_err: Optional[Exception] = None
         for delay in _RETRY_DELAYS:
             try:
-                if not os.path.exists(self._socket_path):
+                loop = self._loop = asyncio.get_running_loop()
+                try:
+                    self._transport, self._protocol = await loop.create_unix_connection(
+                        lambda: _ClientProtocol(self._on_message, self._on_lost),
+                        self._socket_path,
+                    )
+                except FileNotFoundError:
                     raise ConnectionError(
                         f"aslan-browser is not running. Socket not found at {self._socket_path}"
-                    )
-                self._reader, self._writer = await asyncio.open_unix_connection(
-                    self._socket_path
-                )
-                self._read_task = asyncio.create_task(self._read_loop())
+                    ) from None
+                # Same buffer sizes as the sync client, so large replies
+                # don't trickle through the small default UDS buffers.
+                sock = self._transport.get_extra_info("socket")
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, _SOCK_BUFSIZE)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, _SOCK_BUFSIZE)
+                self._framing = "ndjson"
+                await self._negotiate_framing()
 
                 # Auto-create a session so all tabs are tracked and cleaned up
                 if self._auto_session and self._session_id is None:
@@ -102,28 +299,14 @@ class AsyncAslanBrowser:
             self._session_id = None
         self._owned_tabs.clear()
 
-        if self._read_task:
-            self._read_task.cancel()
-            try:
-                await self._read_task
-            except asyncio.CancelledError:
-                pass
-            self._read_task = None
-
-        if self._writer:
-            try:
-                self._writer.close()
-                await self._writer.wait_closed()
-            except OSError:
-                pass
-            self._writer = None
-        self._reader = None
-
         # Fail any pending requests
-        for fut in self._pending.values():
-            if not fut.done():
-                fut.set_exception(ConnectionError("Connection closed."))
-        self._pending.clear()
+        self._fail_pending("Connection closed.")
+
+        if self._transport:
+            self._transport.close()
+            await self._protocol.wait_closed()
+            self._transport = None
+            self._protocol = None
 
     async def __aenter__(self) -> "AsyncAslanBrowser":
         await self.connect()
@@ -132,79 +315,232 @@ class AsyncAslanBrowser:
     async def __aexit__(self, *_: Any) -> None:
         await self.close()
 
+    @staticmethod
+    def install_uvloop() -> bool:
+        """Use uvloop for new event loops if it is installed; returns whether it was.
+
+        Call before ``asyncio.run()``.  The client behaves the same on either
+        loop; uvloop only makes the transport and scheduling underneath faster.
+        """
+        try:
+            import uvloop
+        except ImportError:
+            return False
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        return True
+
     def on_event(self, callback: Callable[[dict], Any]) -> None:
-        """Register a callback for JSON-RPC notifications (events)."""
+        """Register a callback for JSON-RPC notifications (events).
+
+        Coroutine callbacks run as tasks, so a slow handler doesn't hold up
+        responses arriving behind it.
+        """
         self._on_event = callback
+        # Decided once here rather than by inspecting every event's result
+        self._on_event_is_coro = inspect.iscoroutinefunction(callback)
 
-    # ── read loop ────────────────────────────────────────────────────
+    # ── incoming messages ────────────────────────────────────────────
 
-    async def _read_loop(self) -> None:
-        """Background task that reads responses and routes them."""
-        assert self._reader is not None
+    async def _negotiate_framing(self) -> None:
+        """Upgrade the connection to length-prefixed framing if supported."""
+        req_id, future = self._send("protocol.negotiate", {"framing": "len32"})
+        # Set before returning to the loop, so no reply is parsed ahead of it
+        self._protocol.upgrade_id = req_id
         try:
-            while True:
-                line = await self._reader.readline()
-                if not line:
-                    break
-                try:
-                    msg = json.loads(line)
-                except json.JSONDecodeError:
-                    continue
-
-                if "id" in msg and msg["id"] in self._pending:
-                    self._pending[msg["id"]].set_result(msg)
-                elif "method" in msg:
-                    # Notification / event
-                    if self._on_event:
-                        try:
-                            result = self._on_event(msg)
-                            if asyncio.iscoroutine(result):
-                                await result
-                        except Exception:
-                            pass
-        except asyncio.CancelledError:
-            raise
-        except Exception:
-            pass
+            response = await future
         finally:
-            # Connection lost — fail pending
-            for fut in self._pending.values():
-                if not fut.done():
-                    fut.set_exception(ConnectionError("Connection lost."))
-            self._pending.clear()
+            self._protocol.upgrade_id = None
+            self._pending.pop(req_id, None)
+        # Old binaries without protocol.negotiate answer with an error — stay on NDJSON
+        result = response.get("result")
+        if result and result.get("framing") == "len32":
+            self._framing = "len32"
+
+    def _on_message(self, msg: dict) -> None:
+        """Route one decoded message: resolve its request, or fire an event."""
+        # Replies carry an id, events don't: one lookup tells them apart.
+        req_id = msg.get("id")
+        if req_id is not None:
+            # The reply takes its entry out; _call only cleans up after
+            # a cancellation.
+            future = self._pending.pop(req_id, None)
+            if future is not None and not future.done():
+                future.set_result(msg)
+        elif "method" in msg:
+            self._fire_event(msg)
+
+    def _fire_event(self, msg: dict) -> None:
+        callback = self._on_event
+        if callback is None:
+            return
+        if self._on_event_is_coro:
+            result = callback(msg)
+        else:
+            try:
+                result = callback(msg)
+            except Exception:
+                return
+            # Plain handlers return None; only a lambda or wrapper handing
+            # back a coroutine needs the check.
+            if result is None or not asyncio.iscoroutine(result):
+                return
+        task = asyncio.ensure_future(_swallow(result))
+        self._event_tasks.add(task)
+        task.add_done_callback(self._event_tasks.discard)
 
-    # ── low-level RPC ────────────────────────────────────────────────
+    def _on_lost(self) -> None:
+        self._fail_pending("Connection lost.")
 
-    async def _call(self, method: str, params: Optional[dict] = None) -> Any:
-        """Send a JSON-RPC request and return the result."""
-        if self._writer is None:
-            raise ConnectionError("Not connected. Call connect() first.")
+    def _fail_pending(self, reason: str) -> None:
+        futures = [f for *_, f in self._queued]
+        futures += self._pending.values()
+        self._queued.clear()
+        self._pending.clear()
+        for fut in futures:
+            if not fut.done():
+                fut.set_exception(ConnectionError(reason))
 
-        self._next_id += 1
-        req_id = self._next_id
-        request = {
-            "jsonrpc": "2.0",
-            "id": req_id,
-            "method": method,
-            "params": params or {},
-        }
+    # ── low-level RPC ────────────────────────────────────────────────
 
-        future: asyncio.Future = asyncio.get_event_loop().create_future()
+    def _send(self, method: str, params: Optional[dict]) -> tuple[int, asyncio.Future]:
+        """Write one request; returns its id and the future its reply resolves."""
+        transport = self._transport
+        if transport is None:
+            raise ConnectionError("Not connected. Call connect() first.")
+        if self._protocol.lost:
+            # Nothing would ever resolve this request's future
+            raise ConnectionError("Connection lost.")
+
+        req_id = next(self._ids)
+        # A bare loop future: nothing else is needed to hand one reply
+        # to one awaiting _call.
+        future: asyncio.Future = self._loop.create_future()
         self._pending[req_id] = future
 
-        self._writer.write((json.dumps(request) + "\n").encode("utf-8"))
-        await self._writer.drain()
+        # Same encoding as _encode_request(), kept in pieces when params are
+        # large so they are never copied into one combined request
+        # (writelines() sends them with sendmsg where the loop supports it).
+        head = _request_prefix(method)
+        body = _dumps(params) if params else b"{}"
+        if len(body) < _SCATTER_MIN:
+            parts: tuple[bytes, ...] = (b'%s%s,"id":%d}' % (head, body, req_id),)
+        else:
+            parts = (head, body, b',"id":%d}' % req_id)
+        if self._framing == "len32":
+            # Header and body go out together without concatenating them
+            transport.writelines((_LEN_PREFIX.pack(sum(map(len, parts))), *parts))
+        else:
+            transport.writelines((*parts, b"\n"))
+        return req_id, future
 
-        try:
+    async def _call(self, method: str, params: Optional[dict] = None) -> Any:
+        """Send a JSON-RPC request and return the result."""
+        if self._auto_batch and method not in _UNBATCHED:
+            if self._transport is None:
+                raise ConnectionError("Not connected. Call connect() first.")
+            future: asyncio.Future = self._loop.create_future()
+            self._queued.append((method, params, future))
+            if len(self._queued) == 1:
+                self._loop.call_soon(self._flush_queued)
+            elif len(self._queued) >= _AUTO_BATCH_MAX:
+                self._flush_queued()
             response = await future
-        finally:
-            self._pending.pop(req_id, None)
+        else:
+            req_id, future = self._send(method, params)
+            try:
+                # drain() only waits once the transport is over its
+                # high-water mark; below it, skip the extra await.
+                if self._protocol.paused:
+                    await self._protocol.drain()
+                response = await future
+            except BaseException:
+                self._pending.pop(req_id, None)
+                raise
 
         if "error" in response:
             err = response["error"]
             raise AslanBrowserError(err["code"], err["message"])
         return response.get("result")
 
+    async def _call_many(self, requests: list[dict]) -> list[dict]:
+        """Pipeline several requests and return their responses in request order.
+
+        Unlike batch(), each request goes out as its own message, so the
+        server runs them side by side and a slow one doesn't hold back the
+        replies to the others.  Returns the response messages, each with a
+        "result" or "error" key, like batch() items.
+        """
+        sent = [self._send(req["method"], req.get("params")) for req in requests]
+        try:
+            if self._protocol.paused:
+                await self._protocol.drain()
+            return await asyncio.gather(*(future for _, future in sent))
+        finally:
+            for req_id, _ in sent:
+                self._pending.pop(req_id, None)
+
+    def _flush_queued(self) -> None:
+        """Send the calls queued by auto_batch: alone, or as one batch request."""
+        queued, self._queued = self._queued, []
+        if not queued:
+            return
+        futures = [f for *_, f in queued]
+        try:
+            if len(queued) == 1:
+                method, params, _ = queued[0]
+                _, reply = self._send(method, params)
+            else:
+                requests = [{"method": m, "params": p or {}} for m, p, _ in queued]
+                _, reply = self._send("batch", {"requests": requests})
+        except ConnectionError as exc:
+            for fut in futures:
+                if not fut.done():
+                    fut.set_exception(exc)
+            return
+        reply.add_done_callback(
+            lambda r: self._settle_queued(r, futures, len(queued) > 1)
+        )
+
+    def _settle_queued(
+        self, reply: asyncio.Future, futures: list, batched: bool
+    ) -> None:
+        """Hand each queued call its share of the reply.
+
+        Every queued future is resolved, whatever the reply looks like: a
+        failed or malformed batch fails all of them rather than leaving
+        their callers waiting forever.
+        """
+        responses: list = []
+        exc: Optional[BaseException] = None
+        if reply.cancelled():
+            exc = ConnectionError("Connection closed.")
+        elif reply.exception() is not None:
+            exc = reply.exception()
+        else:
+            response = reply.result()
+            if not batched:
+                responses = [response]
+            else:
+                try:
+                    if "error" in response:
+                        err = response["error"]
+                        exc = AslanBrowserError(err["code"], err["message"])
+                    else:
+                        responses = response["result"]["responses"]
+                        if len(responses) != len(futures) or not all(
+                            isinstance(r, dict) for r in responses
+                        ):
+                            raise ValueError("wrong number or kind of items")
+                except Exception as e:  # any unexpected shape
+                    exc = AslanBrowserError(-32603, f"Malformed batch response: {e!r}")
+        for i, fut in enumerate(futures):
+            if fut.done():
+                continue
+            if exc is not None:
+                fut.set_exception(exc)
+            else:
+                fut.set_result(responses[i])
+
     # ── navigation ───────────────────────────────────────────────────
 
     async def navigate(
@@ -241,6 +577,25 @@ class AsyncAslanBrowser:
             {"tabId": tab_id, "selector": selector, "timeout": timeout},
         )
 
+    async def wait_for_node(
+        self,
+        role: str,
+        name_hint: Optional[str] = None,
+        tab_id: str = "tab0",
+        timeout: int = 5000,
+    ) -> dict:
+        """Wait until the accessibility tree has a node with ``role``.
+
+        If ``name_hint`` is given, the node's name or value must also contain
+        it (case-insensitive). Re-checks on DOM mutations in the page, so it
+        returns as soon as the node appears. Returns the matching A11yNode.
+        """
+        params: dict[str, Any] = {"tabId": tab_id, "role": role, "timeout": timeout}
+        if name_hint:
+            params["nameHint"] = name_hint
+        result = await self._call("waitForNode", params)
+        return result.get("node", {})
+
     # ── evaluation ───────────────────────────────────────────────────
 
     async def evaluate(
@@ -272,6 +627,14 @@ class AsyncAslanBrowser:
         result = await self._call("getAccessibilityTree", {"tabId": tab_id})
         return result.get("tree", [])
 
+    async def get_tree_index(self, tab_id: str = "tab0") -> TreeIndex:
+        """Fetch the accessibility tree once and wrap it in a TreeIndex.
+
+        Reuse the index for every lookup against the same page state instead
+        of fetching the tree again.
+        """
+        return TreeIndex(await self.get_accessibility_tree(tab_id=tab_id))
+
     # ── interaction ──────────────────────────────────────────────────
 
     async def click(self, target: str, tab_id: str = "tab0") -> None:
@@ -282,12 +645,55 @@ class AsyncAslanBrowser:
         """Fill an input element."""
         await self._call("fill", {"tabId": tab_id, "selector": target, "value": value})
 
+    async def type_into(self, target: str, value: str, tab_id: str = "tab0") -> None:
+        """Click an element, then fill it, in a single sequential batch call."""
+        responses = await self.batch(
+            [
+                {"method": "click", "params": {"tabId": tab_id, "selector": target}},
+                {
+                    "method": "fill",
+                    "params": {"tabId": tab_id, "selector": target, "value": value},
+                },
+            ],
+            sequential=True,
+        )
+        for response in responses:
+            if "error" in response:
+                err = response["error"]
+                raise AslanBrowserError(err["code"], err["message"])
+
     async def select(self, target: str, value: str, tab_id: str = "tab0") -> None:
         """Select an option in a <select> element."""
         await self._call(
             "select", {"tabId": tab_id, "selector": target, "value": value}
         )
 
+    async def upload_file(
+        self,
+        path: str,
+        selector: str = 'input[type="file"]',
+        name: Optional[str] = None,
+        mime_type: Optional[str] = None,
+        tab_id: str = "tab0",
+    ) -> int:
+        """Set a local file on a file input and fire ``change``. Returns the size in bytes.
+
+        The server reads the file from ``path`` itself, so no file contents
+        cross the socket. ``name`` and ``mime_type`` default to the file's
+        basename and extension-derived type.
+        """
+        params: dict[str, Any] = {
+            "tabId": tab_id,
+            "selector": selector,
+            "path": os.path.abspath(path),
+        }
+        if name:
+            params["name"] = name
+        if mime_type:
+            params["mimeType"] = mime_type
+        result = await self._call("uploadFile", params)
+        return result.get("size", 0)
+
     async def keypress(
         self,
         key: str,
@@ -316,13 +722,22 @@ class AsyncAslanBrowser:
     # ── screenshots ──────────────────────────────────────────────────
 
     async def screenshot(
-        self, tab_id: str = "tab0", quality: int = 70, width: int = 1440
+        self,
+        tab_id: str = "tab0",
+        quality: int = 70,
+        width: int = 1440,
+        target_kb: Optional[int] = None,
+        max_tries: int = 3,
     ) -> bytes:
-        """Take a screenshot. Returns JPEG bytes."""
-        result = await self._call(
-            "screenshot", {"tabId": tab_id, "quality": quality, "width": width}
-        )
-        return base64.b64decode(result["data"])
+        """Take a screenshot. Returns JPEG bytes.
+
+        With ``target_kb``, ``quality`` is ignored and the server picks the
+        highest quality (in steps of 10, up to ``max_tries`` encodes) whose
+        JPEG fits in that many KB, remembering it per URL and width.
+        """
+        params = _screenshot_params(tab_id, quality, width, target_kb, max_tries)
+        result = await self._call("screenshot", params)
+        return _b64decode(result["data"])
 
     async def save_screenshot(
         self,
@@ -330,12 +745,37 @@ class AsyncAslanBrowser:
         tab_id: str = "tab0",
         quality: int = 70,
         width: int = 1440,
+        target_kb: Optional[int] = None,
+        max_tries: int = 3,
     ) -> int:
-        """Take a screenshot and save to a file. Returns file size in bytes."""
-        data = await self.screenshot(tab_id=tab_id, quality=quality, width=width)
-        with open(path, "wb") as f:
-            f.write(data)
-        return len(data)
+        """Take a screenshot and save to a file. Returns file size in bytes.
+
+        The server writes the file directly, so the image never crosses the
+        socket; older servers fall back to writing it here.
+        """
+        params = _screenshot_params(tab_id, quality, width, target_kb, max_tries)
+        params["path"] = os.path.abspath(path)
+        result = await self._call("screenshot", params)
+        if "size" in result:
+            return result["size"]
+        # Older server sent the image back: decode and write it off the loop
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, _write_b64_file, path, result["data"])
+
+    async def snapshot(
+        self, tab_id: str = "tab0", quality: int = 70, width: int = 1440
+    ) -> dict:
+        """Get URL, title and a screenshot of one page state concurrently.
+
+        Returns:
+            {"url": str, "title": str, "screenshot": bytes}
+        """
+        url, title, shot = await _gather_eager(
+            self.get_url(tab_id=tab_id),
+            self.get_title(tab_id=tab_id),
+            self.screenshot(tab_id=tab_id, quality=quality, width=width),
+        )
+        return {"url": url, "title": title, "screenshot": shot}
 
     # ── cookies ──────────────────────────────────────────────────────
 
@@ -416,6 +856,33 @@ class AsyncAslanBrowser:
         result = await self._call("tab.list", params)
         return result.get("tabs", [])
 
+    async def tab_exists(self, tab_id: str) -> bool:
+        """Check whether a tab is open without fetching the whole tab list."""
+        try:
+            result = await self._call("tab.exists", {"tabId": tab_id})
+        except AslanBrowserError as e:
+            if e.code != -32601:
+                raise
+            return any(t.get("tabId") == tab_id for t in await self.tab_list())
+        return bool(result.get("exists"))
+
+    async def status(self, include_tabs: bool = False) -> dict:
+        """Connection status in one call: ``{socket, tabCount}`` plus ``tabs`` if requested.
+
+        Falls back to ``tab.list`` on servers without the ``status`` method.
+        """
+        params = {"includeTabs": True} if include_tabs else {}
+        try:
+            result = await self._call("status", params)
+        except AslanBrowserError as e:
+            if e.code != -32601:
+                raise
+            tabs = await self.tab_list()
+            result = {"tabCount": len(tabs)}
+            if include_tabs:
+                result["tabs"] = tabs
+        return {"socket": self._socket_path, **result}
+
     # ── sessions ─────────────────────────────────────────────────────
 
     async def session_create(self, name: Optional[str] = None) -> str:
@@ -454,16 +921,23 @@ class AsyncAslanBrowser:
 
     # ── batch operations ─────────────────────────────────────────────
 
-    async def batch(self, requests: list[dict]) -> list[dict]:
+    async def batch(
+        self, requests: list[dict], sequential: bool = False
+    ) -> list[dict]:
         """Execute multiple requests in one round-trip.
 
         Args:
             requests: List of {"method": ..., "params": ...} dicts.
+            sequential: Run the requests one after another, in order, instead
+                of concurrently. Use for dependent steps like click → fill.
 
         Returns:
             List of {"result": ...} or {"error": ...} dicts, in same order.
         """
-        result = await self._call("batch", {"requests": requests})
+        params: dict[str, Any] = {"requests": requests}
+        if sequential:
+            params["sequential"] = True
+        result = await self._call("batch", params)
         return result.get("responses", [])
 
     async def parallel_get_trees(self, tab_ids: list[str]) -> dict[str, list[dict]]:
@@ -477,14 +951,11 @@ class AsyncAslanBrowser:
             {"method": "getAccessibilityTree", "params": {"tabId": tid}}
             for tid in tab_ids
         ]
-        responses = await self.batch(requests)
-        result = {}
-        for tid, resp in zip(tab_ids, responses):
-            if "result" in resp:
-                result[tid] = resp["result"].get("tree", [])
-            else:
-                result[tid] = []
-        return result
+        responses = await self._call_many(requests)
+        return {
+            tid: resp["result"].get("tree", []) if "result" in resp else []
+            for tid, resp in zip(tab_ids, responses)
+        }
 
     async def parallel_navigate(
         self,
@@ -504,14 +975,13 @@ class AsyncAslanBrowser:
             {"method": "navigate", "params": {"tabId": tid, "url": url, "waitUntil": wait_until}}
             for tid, url in urls.items()
         ]
-        responses = await self.batch(requests)
-        result = {}
-        for (tid, _), resp in zip(urls.items(), responses):
-            if "result" in resp:
-                result[tid] = resp["result"]
-            else:
-                result[tid] = resp.get("error", {"message": "Unknown error"})
-        return result
+        responses = await self._call_many(requests)
+        # dicts iterate in insertion order, so the keys line up with requests
+        return {
+            tid: resp["result"] if "result" in resp
+            else resp.get("error", {"message": "Unknown error"})
+            for tid, resp in zip(urls, responses)
+        }
 
     async def parallel_screenshots(
         self, tab_ids: list[str], quality: int = 70, width: int = 1440
@@ -525,9 +995,9 @@ class AsyncAslanBrowser:
             {"method": "screenshot", "params": {"tabId": tid, "quality": quality, "width": width}}
             for tid in tab_ids
         ]
-        responses = await self.batch(requests)
-        result = {}
-        for tid, resp in zip(tab_ids, responses):
-            if "result" in resp and "data" in resp["result"]:
-                result[tid] = base64.b64decode(resp["result"]["data"])
-        return result
+        responses = await self._call_many(requests)
+        return {
+            tid: _b64decode(resp["result"]["data"])
+            for tid, resp in zip(tab_ids, responses)
+            if "result" in resp and "data" in resp["result"]
+        }
@@ -3,62 +3,111 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
 import json
 import os
 import sys
-from typing import Any, Optional
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional
 
-from aslan_browser import __version__
-from aslan_browser.client import AslanBrowser, AslanBrowserError
+from aslan_browser._version import __version__
 
-_STATE_FILE = "/tmp/aslan-cli.json"
+if TYPE_CHECKING:
+    from aslan_browser.client import AslanBrowser
+
+# Per-user runtime dir where there is one (Linux), /tmp otherwise (macOS).
+_STATE_FILE = Path(os.environ.get("XDG_RUNTIME_DIR") or "/tmp") / "aslan-cli.tab"
 
 
 # ── State management ──────────────────────────────────────────────
 
-def _load_state() -> dict:
-    """Load CLI state from disk. Creates default if missing."""
-    if os.path.exists(_STATE_FILE):
+# Current tab as last read or written by this process. Each CLI call is one
+# process and all writes go through _save_state, so reading once is enough.
+_cached_tab: Optional[str] = None
+
+
+def _load_state() -> str:
+    """Load the current tab ID from disk (once per process). Defaults to tab0."""
+    global _cached_tab
+    if _cached_tab is None:
         try:
-            with open(_STATE_FILE) as f:
-                return json.load(f)
-        except (json.JSONDecodeError, OSError):
-            pass
-    return {"tab": "tab0"}
+            _cached_tab = _STATE_FILE.read_bytes().strip().decode() or "tab0"
+        except OSError:
+            _cached_tab = "tab0"
+    return _cached_tab
 
 
-def _save_state(state: dict) -> None:
-    """Write CLI state to disk."""
-    with open(_STATE_FILE, "w") as f:
-        json.dump(state, f)
+def _save_state(tab_id: str) -> None:
+    """Write the current tab ID to disk."""
+    global _cached_tab
+    _STATE_FILE.write_bytes(tab_id.encode() + b"\n")
+    _cached_tab = tab_id
 
 
 def _current_tab(args: argparse.Namespace) -> str:
     """Resolve the target tab: explicit --tab flag, or current from state."""
     if hasattr(args, "tab") and args.tab:
         return args.tab
-    return _load_state().get("tab", "tab0")
+    return _load_state()
 
 
 def _set_current_tab(tab_id: str) -> None:
     """Update the current tab in the state file."""
-    state = _load_state()
-    state["tab"] = tab_id
-    _save_state(state)
+    _save_state(tab_id)
 
 
 # ── Connection helper ─────────────────────────────────────────────
 
-def _connect() -> AslanBrowser:
+# One connection per process, shared by a command and its tab-not-found
+# retry. Commands use it as a context manager; _run closes it at the end.
+_conn: Optional[AslanBrowser] = None
+
+
+def _connect() -> contextlib.AbstractContextManager[AslanBrowser]:
     """Connect to Aslan Browser. auto_session=False — CLI is stateless per call."""
-    return AslanBrowser(auto_session=False)
+    global _conn
+    if _conn is None:
+        from aslan_browser.client import AslanBrowser
+
+        _conn = AslanBrowser(auto_session=False)
+    return contextlib.nullcontext(_conn)
+
+
+def _disconnect() -> None:
+    """Close the process's connection, if one was opened."""
+    global _conn
+    if _conn is not None:
+        _conn.close()
+        _conn = None
 
 
 # ── Output formatting ─────────────────────────────────────────────
 
 def _print_json(data: Any) -> None:
-    """Print data as formatted JSON."""
-    print(json.dumps(data, indent=2, ensure_ascii=False))
+    """Write data to stdout as JSON: indented on a terminal, compact when piped.
+
+    Uses orjson (the ``fast`` extra) when installed, writing its UTF-8 bytes
+    straight to the binary stream.
+    """
+    out = sys.stdout
+    tty = out.isatty()
+    try:
+        import orjson
+
+        buf = out.buffer
+    except (ImportError, AttributeError):
+        if tty:
+            json.dump(data, out, indent=2, ensure_ascii=False)
+        else:
+            json.dump(data, out, separators=(",", ":"), ensure_ascii=False)
+        out.write("\n")
+        return
+
+    option = orjson.OPT_APPEND_NEWLINE
+    if tty:
+        option |= orjson.OPT_INDENT_2
+    out.flush()
+    buf.write(orjson.dumps(data, option=option))
 
 
 def _format_tree_node(node: dict) -> str:
@@ -67,10 +116,9 @@ def _format_tree_node(node: dict) -> str:
     role = node.get("role", "?")
     name = node.get("name", "")
     value = node.get("value")
-    line = f'{ref} {role} "{name}"'
-    if value is not None and value != "":
-        line += f' value="{value}"'
-    return line
+    if value:
+        return "".join((ref, " ", role, ' "', name, '" value="', value, '"'))
+    return "".join((ref, " ", role, ' "', name, '"'))
 
 
 def _print_nav_result(result: dict) -> None:
@@ -92,6 +140,8 @@ def _handle_tab_not_found(tab_id: str) -> str:
 
 def _run(func, args: argparse.Namespace) -> int:
     """Run a command handler with standard error handling. Returns exit code."""
+    from aslan_browser.client import AslanBrowserError
+
     try:
         func(args)
         return 0
@@ -117,28 +167,32 @@ def _run(func, args: argparse.Namespace) -> int:
         return 1
     except KeyboardInterrupt:
         return 130
+    finally:
+        _disconnect()
 
 
 # ── Argument parser ───────────────────────────────────────────────
 
-def _build_parser() -> argparse.ArgumentParser:
-    parser = argparse.ArgumentParser(
-        prog="aslan",
-        description="Drive Aslan Browser from the command line.",
-    )
-    parser.add_argument("--version", action="version", version=f"aslan {__version__}")
+# Each CLI call runs exactly one command, so subparsers are registered on
+# demand: one _add_* per command, looked up by name in _SUBCOMMANDS.
 
-    sub = parser.add_subparsers(dest="command")
+# ── status ────────────────────────────────────────────────────
 
-    # ── status ────────────────────────────────────────────────────
+def _add_status(sub) -> None:
     p = sub.add_parser("status", help="Check if Aslan Browser is running")
     p.set_defaults(func=cmd_status)
 
-    # ── source ────────────────────────────────────────────────────
+
+# ── source ────────────────────────────────────────────────────
+
+def _add_source(sub) -> None:
     p = sub.add_parser("source", help="Print SDK source path")
     p.set_defaults(func=cmd_source)
 
-    # ── navigation ────────────────────────────────────────────────
+
+# ── navigation ────────────────────────────────────────────────
+
+def _add_nav(sub) -> None:
     p = sub.add_parser("nav", help="Navigate to a URL")
     p.add_argument("url", help="URL to navigate to")
     p.add_argument("--wait", choices=["none", "load", "idle"], default="load",
@@ -148,76 +202,106 @@ def _build_parser() -> argparse.ArgumentParser:
     p.add_argument("--json", action="store_true", dest="json_output")
     p.set_defaults(func=cmd_nav)
 
+
+def _add_back(sub) -> None:
     p = sub.add_parser("back", help="Navigate back")
     p.add_argument("--tab", help="Target tab ID")
     p.add_argument("--json", action="store_true", dest="json_output")
     p.set_defaults(func=cmd_back)
 
+
+def _add_forward(sub) -> None:
     p = sub.add_parser("forward", help="Navigate forward")
     p.add_argument("--tab", help="Target tab ID")
     p.add_argument("--json", action="store_true", dest="json_output")
     p.set_defaults(func=cmd_forward)
 
+
+def _add_reload(sub) -> None:
     p = sub.add_parser("reload", help="Reload the page")
     p.add_argument("--tab", help="Target tab ID")
     p.add_argument("--json", action="store_true", dest="json_output")
     p.set_defaults(func=cmd_reload)
 
-    # ── reading ───────────────────────────────────────────────────
+
+# ── reading ───────────────────────────────────────────────────
+
+def _add_tree(sub) -> None:
     p = sub.add_parser("tree", help="Print accessibility tree")
     p.add_argument("--tab", help="Target tab ID")
     p.add_argument("--json", action="store_true", dest="json_output")
     p.set_defaults(func=cmd_tree)
 
+
+def _add_title(sub) -> None:
     p = sub.add_parser("title", help="Print page title")
     p.add_argument("--tab", help="Target tab ID")
     p.set_defaults(func=cmd_title)
 
+
+def _add_url(sub) -> None:
     p = sub.add_parser("url", help="Print current URL")
     p.add_argument("--tab", help="Target tab ID")
     p.set_defaults(func=cmd_url)
 
+
+def _add_text(sub) -> None:
     p = sub.add_parser("text", help="Print page text content")
     p.add_argument("--chars", type=int, default=3000, help="Max characters (default: 3000)")
     p.add_argument("--tab", help="Target tab ID")
     p.set_defaults(func=cmd_text)
 
+
+def _add_html(sub) -> None:
     p = sub.add_parser("html", help="Print page HTML")
     p.add_argument("--chars", type=int, default=20000, help="Max characters (default: 20000)")
     p.add_argument("--selector", help="Get innerHTML of a specific element instead of body")
     p.add_argument("--tab", help="Target tab ID")
     p.set_defaults(func=cmd_html)
 
+
+def _add_eval(sub) -> None:
     p = sub.add_parser("eval", help="Evaluate JavaScript")
     p.add_argument("script", help='JavaScript to evaluate (must use "return")')
     p.add_argument("--tab", help="Target tab ID")
     p.add_argument("--json", action="store_true", dest="json_output")
     p.set_defaults(func=cmd_eval)
 
-    # ── interaction ───────────────────────────────────────────────
+
+# ── interaction ───────────────────────────────────────────────
+
+def _add_click(sub) -> None:
     p = sub.add_parser("click", help="Click an element")
     p.add_argument("target", help="@eN ref or CSS selector")
     p.add_argument("--tab", help="Target tab ID")
     p.set_defaults(func=cmd_click)
 
+
+def _add_fill(sub) -> None:
     p = sub.add_parser("fill", help="Fill an input field")
     p.add_argument("target", help="@eN ref or CSS selector")
     p.add_argument("value", help="Value to fill")
     p.add_argument("--tab", help="Target tab ID")
     p.set_defaults(func=cmd_fill)
 
+
+def _add_type(sub) -> None:
     p = sub.add_parser("type", help="Type text into any field (works on contenteditable)")
     p.add_argument("target", help="@eN ref or CSS selector")
     p.add_argument("value", help="Text to type")
     p.add_argument("--tab", help="Target tab ID")
     p.set_defaults(func=cmd_type)
 
+
+def _add_select(sub) -> None:
     p = sub.add_parser("select", help="Select a dropdown option")
     p.add_argument("target", help="@eN ref or CSS selector")
     p.add_argument("value", help="Option value to select")
     p.add_argument("--tab", help="Target tab ID")
     p.set_defaults(func=cmd_select)
 
+
+def _add_key(sub) -> None:
     p = sub.add_parser("key", help="Send a keypress")
     p.add_argument("key_name", metavar="key", help="Key name: Enter, Tab, a, etc.")
     p.add_argument("--meta", action="store_true", help="Hold Cmd/Meta")
@@ -227,6 +311,8 @@ def _build_parser() -> argparse.ArgumentParser:
     p.add_argument("--tab", help="Target tab ID")
     p.set_defaults(func=cmd_key)
 
+
+def _add_scroll(sub) -> None:
     p = sub.add_parser("scroll", help="Scroll the page")
     p.add_argument("--down", type=int, metavar="PX", help="Scroll down by pixels")
     p.add_argument("--up", type=int, metavar="PX", help="Scroll up by pixels")
@@ -234,7 +320,10 @@ def _build_parser() -> argparse.ArgumentParser:
     p.add_argument("--tab", help="Target tab ID")
     p.set_defaults(func=cmd_scroll)
 
-    # ── wait ──────────────────────────────────────────────────────
+
+# ── wait ──────────────────────────────────────────────────────
+
+def _add_wait(sub) -> None:
     p = sub.add_parser("wait", help="Wait for page to reach a readiness state")
     p.add_argument("--idle", action="store_true", help="Wait for network idle + DOM stable")
     p.add_argument("--load", action="store_true", help="Wait for page load")
@@ -242,7 +331,10 @@ def _build_parser() -> argparse.ArgumentParser:
     p.add_argument("--tab", help="Target tab ID")
     p.set_defaults(func=cmd_wait)
 
-    # ── file upload ────────────────────────────────────────────────
+
+# ── file upload ────────────────────────────────────────────────
+
+def _add_upload(sub) -> None:
     p = sub.add_parser("upload", help="Upload a file to an input[type=file]")
     p.add_argument("file", help="Path to file to upload")
     p.add_argument("--selector", default='input[type="file"]',
@@ -251,7 +343,10 @@ def _build_parser() -> argparse.ArgumentParser:
     p.add_argument("--tab", help="Target tab ID")
     p.set_defaults(func=cmd_upload)
 
-    # ── screenshots ───────────────────────────────────────────────
+
+# ── screenshots ───────────────────────────────────────────────
+
+def _add_shot(sub) -> None:
     p = sub.add_parser("shot", help="Take a screenshot")
     p.add_argument("path", nargs="?", default="/tmp/aslan-screenshot.jpg",
                     help="Output file path (default: /tmp/aslan-screenshot.jpg)")
@@ -260,11 +355,16 @@ def _build_parser() -> argparse.ArgumentParser:
     p.add_argument("--tab", help="Target tab ID")
     p.set_defaults(func=cmd_shot)
 
-    # ── tab management ────────────────────────────────────────────
+
+# ── tab management ────────────────────────────────────────────
+
+def _add_tabs(sub) -> None:
     p = sub.add_parser("tabs", help="List all open tabs")
     p.add_argument("--json", action="store_true", dest="json_output")
     p.set_defaults(func=cmd_tabs)
 
+
+def _add_tab_new(sub) -> None:
     p = sub.add_parser("tab:new", help="Create a new tab and switch to it")
     p.add_argument("url", nargs="?", help="URL to navigate to")
     p.add_argument("--hidden", action="store_true", help="Create hidden tab")
@@ -273,40 +373,58 @@ def _build_parser() -> argparse.ArgumentParser:
     p.add_argument("--json", action="store_true", dest="json_output")
     p.set_defaults(func=cmd_tab_new)
 
+
+def _add_tab_close(sub) -> None:
     p = sub.add_parser("tab:close", help="Close a tab")
     p.add_argument("tab_id", nargs="?", help="Tab ID to close (default: current tab)")
     p.set_defaults(func=cmd_tab_close)
 
+
+def _add_tab_use(sub) -> None:
     p = sub.add_parser("tab:use", help="Switch the current tab")
     p.add_argument("tab_id", help="Tab ID to switch to")
     p.set_defaults(func=cmd_tab_use)
 
+
+def _add_tab_wait(sub) -> None:
     p = sub.add_parser("tab:wait", help="Wait for a CSS selector to appear")
     p.add_argument("selector", help="CSS selector to wait for")
     p.add_argument("--timeout", type=int, default=5000, help="Timeout in ms (default: 5000)")
     p.add_argument("--tab", help="Target tab ID")
     p.set_defaults(func=cmd_tab_wait)
 
-    # ── learn mode ────────────────────────────────────────────────
+
+# ── learn mode ────────────────────────────────────────────────
+
+def _add_learn_start(sub) -> None:
     p = sub.add_parser("learn:start", help="Start learn mode recording")
     p.add_argument("name", help="Recording name (e.g., reddit-create-post)")
     p.set_defaults(func=cmd_learn_start)
 
+
+def _add_learn_stop(sub) -> None:
     p = sub.add_parser("learn:stop", help="Stop learn mode recording")
     p.add_argument("--json", action="store_true", dest="json_output",
                     help="Output full action log as JSON")
     p.set_defaults(func=cmd_learn_stop)
 
+
+def _add_learn_status(sub) -> None:
     p = sub.add_parser("learn:status", help="Check learn mode status")
     p.set_defaults(func=cmd_learn_status)
 
-    # ── cookies ───────────────────────────────────────────────────
+
+# ── cookies ───────────────────────────────────────────────────
+
+def _add_cookies(sub) -> None:
     p = sub.add_parser("cookies", help="Get cookies")
     p.add_argument("--url", help="Filter by URL")
     p.add_argument("--tab", help="Target tab ID")
     p.add_argument("--json", action="store_true", dest="json_output")
     p.set_defaults(func=cmd_cookies)
 
+
+def _add_set_cookie(sub) -> None:
     p = sub.add_parser("set-cookie", help="Set a cookie")
     p.add_argument("name", help="Cookie name")
     p.add_argument("value", help="Cookie value")
@@ -316,6 +434,60 @@ def _build_parser() -> argparse.ArgumentParser:
     p.add_argument("--tab", help="Target tab ID")
     p.set_defaults(func=cmd_set_cookie)
 
+
+_SUBCOMMANDS = {
+    "status": _add_status,
+    "source": _add_source,
+    "nav": _add_nav,
+    "back": _add_back,
+    "forward": _add_forward,
+    "reload": _add_reload,
+    "tree": _add_tree,
+    "title": _add_title,
+    "url": _add_url,
+    "text": _add_text,
+    "html": _add_html,
+    "eval": _add_eval,
+    "click": _add_click,
+    "fill": _add_fill,
+    "type": _add_type,
+    "select": _add_select,
+    "key": _add_key,
+    "scroll": _add_scroll,
+    "wait": _add_wait,
+    "upload": _add_upload,
+    "shot": _add_shot,
+    "tabs": _add_tabs,
+    "tab:new": _add_tab_new,
+    "tab:close": _add_tab_close,
+    "tab:use": _add_tab_use,
+    "tab:wait": _add_tab_wait,
+    "learn:start": _add_learn_start,
+    "learn:stop": _add_learn_stop,
+    "learn:status": _add_learn_status,
+    "cookies": _add_cookies,
+    "set-cookie": _add_set_cookie,
+}
+
+
+def _build_parser(command: Optional[str] = None) -> argparse.ArgumentParser:
+    """Build the argument parser.
+
+    If ``command`` is a known subcommand, only its subparser is built; help,
+    unknown commands and bare ``aslan`` get the full parser.
+    """
+    parser = argparse.ArgumentParser(
+        prog="aslan",
+        description="Drive Aslan Browser from the command line.",
+    )
+    parser.add_argument("--version", action="version", version=f"aslan {__version__}")
+
+    sub = parser.add_subparsers(dest="command")
+    if command in _SUBCOMMANDS:
+        _SUBCOMMANDS[command](sub)
+    else:
+        for add in _SUBCOMMANDS.values():
+            add(sub)
     return parser
 
 
@@ -325,15 +497,13 @@ def _build_parser() -> argparse.ArgumentParser:
 
 def cmd_status(args: argparse.Namespace) -> None:
     """Check connection status."""
-    state = _load_state()
+    current = _load_state()
     try:
-        b = _connect()
-        tabs = b.tab_list()
-        b.close()
-        current = state.get("tab", "tab0")
-        print(f"Connected to /tmp/aslan-browser.sock")
+        with _connect() as b:
+            status = b.status()
+        print(f"Connected to {status['socket']}")
         print(f"Current tab: {current}")
-        print(f"Open tabs: {len(tabs)}")
+        print(f"Open tabs: {status['tabCount']}")
     except ConnectionError as e:
         print(f"Not connected: {e}")
         sys.exit(1)
@@ -349,197 +519,157 @@ def cmd_source(args: argparse.Namespace) -> None:
 
 def cmd_nav(args: argparse.Namespace) -> None:
     tab = _current_tab(args)
-    b = _connect()
-    try:
+    with _connect() as b:
         result = b.navigate(args.url, tab_id=tab, wait_until=args.wait, timeout=args.timeout)
         if getattr(args, "json_output", False):
             _print_json(result)
         else:
             _print_nav_result(result)
-    finally:
-        b.close()
 
 
 def cmd_back(args: argparse.Namespace) -> None:
     tab = _current_tab(args)
-    b = _connect()
-    try:
+    with _connect() as b:
         result = b.go_back(tab_id=tab)
         if getattr(args, "json_output", False):
             _print_json(result)
         else:
             _print_nav_result(result)
-    finally:
-        b.close()
 
 
 def cmd_forward(args: argparse.Namespace) -> None:
     tab = _current_tab(args)
-    b = _connect()
-    try:
+    with _connect() as b:
         result = b.go_forward(tab_id=tab)
         if getattr(args, "json_output", False):
             _print_json(result)
         else:
             _print_nav_result(result)
-    finally:
-        b.close()
 
 
 def cmd_reload(args: argparse.Namespace) -> None:
     tab = _current_tab(args)
-    b = _connect()
-    try:
+    with _connect() as b:
         result = b.reload(tab_id=tab)
         if getattr(args, "json_output", False):
             _print_json(result)
         else:
             _print_nav_result(result)
-    finally:
-        b.close()
 
 
 # ── reading ───────────────────────────────────────────────────────
 
 def cmd_tree(args: argparse.Namespace) -> None:
     tab = _current_tab(args)
-    b = _connect()
-    try:
+    with _connect() as b:
         tree = b.get_accessibility_tree(tab_id=tab)
         if getattr(args, "json_output", False):
             _print_json(tree)
         else:
-            for node in tree:
-                print(_format_tree_node(node))
-    finally:
-        b.close()
+            if tree:
+                sys.stdout.write("\n".join(map(_format_tree_node, tree)))
+                sys.stdout.write("\n")
 
 
 def cmd_title(args: argparse.Namespace) -> None:
     tab = _current_tab(args)
-    b = _connect()
-    try:
+    with _connect() as b:
         print(b.get_title(tab_id=tab))
-    finally:
-        b.close()
 
 
 def cmd_url(args: argparse.Namespace) -> None:
     tab = _current_tab(args)
-    b = _connect()
-    try:
+    with _connect() as b:
         print(b.get_url(tab_id=tab))
-    finally:
-        b.close()
+
+
+# Page scripts are fixed strings with values passed as evaluate args, so
+# every call sends byte-identical source and WebKit can reuse its compile.
+_TEXT_JS = "return document.body.innerText.substring(0, n)"
+_HTML_JS = "return document.body.innerHTML.substring(0, n)"
+_HTML_SELECTOR_JS = 'var el = document.querySelector(sel); return el ? el.innerHTML.substring(0, n) : "error: not found"'
 
 
 def cmd_text(args: argparse.Namespace) -> None:
     tab = _current_tab(args)
-    b = _connect()
-    try:
-        text = b.evaluate(
-            f"return document.body.innerText.substring(0, {args.chars})",
-            tab_id=tab,
-        )
+    with _connect() as b:
+        text = b.evaluate(_TEXT_JS, tab_id=tab, args={"n": args.chars})
         print(text or "")
-    finally:
-        b.close()
 
 
 def cmd_html(args: argparse.Namespace) -> None:
     tab = _current_tab(args)
-    b = _connect()
-    try:
+    with _connect() as b:
         if args.selector:
-            js = f'var el = document.querySelector(sel); return el ? el.innerHTML.substring(0, {args.chars}) : "error: not found"'
-            html = b.evaluate(js, tab_id=tab, args={"sel": args.selector})
+            html = b.evaluate(_HTML_SELECTOR_JS, tab_id=tab, args={"sel": args.selector, "n": args.chars})
         else:
-            html = b.evaluate(
-                f"return document.body.innerHTML.substring(0, {args.chars})",
-                tab_id=tab,
-            )
+            html = b.evaluate(_HTML_JS, tab_id=tab, args={"n": args.chars})
         print(html or "")
-    finally:
-        b.close()
 
 
 def cmd_eval(args: argparse.Namespace) -> None:
     tab = _current_tab(args)
-    b = _connect()
-    try:
+    with _connect() as b:
         result = b.evaluate(args.script, tab_id=tab)
         if getattr(args, "json_output", False):
             _print_json(result)
         else:
             if result is not None:
                 print(result)
-    finally:
-        b.close()
 
 
 # ── interaction ───────────────────────────────────────────────────
 
 def cmd_click(args: argparse.Namespace) -> None:
     tab = _current_tab(args)
-    b = _connect()
-    try:
+    with _connect() as b:
         b.click(args.target, tab_id=tab)
         print("ok")
-    finally:
-        b.close()
 
 
 def cmd_fill(args: argparse.Namespace) -> None:
     tab = _current_tab(args)
-    b = _connect()
-    try:
+    with _connect() as b:
         b.fill(args.target, args.value, tab_id=tab)
         print("ok")
-    finally:
-        b.close()
+
+
+_TYPE_JS = """
+    var el = document.querySelector(sel);
+    if (!el) return "error: element not found";
+    el.focus();
+    if (el.isContentEditable || el.getAttribute("contenteditable") === "true") {
+        document.execCommand("insertText", false, text);
+        return "typed (contenteditable)";
+    } else if (el.tagName === "INPUT" || el.tagName === "TEXTAREA") {
+        el.value = text;
+        el.dispatchEvent(new Event("input", { bubbles: true }));
+        el.dispatchEvent(new Event("change", { bubbles: true }));
+        return "typed (input)";
+    } else {
+        el.focus();
+        document.execCommand("insertText", false, text);
+        return "typed (execCommand fallback)";
+    }
+"""
 
 
 def cmd_type(args: argparse.Namespace) -> None:
     tab = _current_tab(args)
-    b = _connect()
-    try:
+    with _connect() as b:
         # Resolve @eN refs to CSS selector
         target = args.target
         if target.startswith("@e"):
             target = f'[data-agent-ref="{target}"]'
-
-        js = """
-        var el = document.querySelector(sel);
-        if (!el) return "error: element not found";
-        el.focus();
-        if (el.isContentEditable || el.getAttribute("contenteditable") === "true") {
-            document.execCommand("insertText", false, text);
-            return "typed (contenteditable)";
-        } else if (el.tagName === "INPUT" || el.tagName === "TEXTAREA") {
-            el.value = text;
-            el.dispatchEvent(new Event("input", { bubbles: true }));
-            el.dispatchEvent(new Event("change", { bubbles: true }));
-            return "typed (input)";
-        } else {
-            el.focus();
-            document.execCommand("insertText", false, text);
-            return "typed (execCommand fallback)";
-        }
-        """
-        result = b.evaluate(js, tab_id=tab, args={"sel": target, "text": args.value})
+        result = b.evaluate(_TYPE_JS, tab_id=tab, args={"sel": target, "text": args.value})
         print(result or "ok")
-    finally:
-        b.close()
 
 
 def cmd_select(args: argparse.Namespace) -> None:
     tab = _current_tab(args)
-    b = _connect()
-    try:
+    with _connect() as b:
         b.select(args.target, args.value, tab_id=tab)
         print("ok")
-    finally:
-        b.close()
 
 
 def cmd_key(args: argparse.Namespace) -> None:
@@ -553,18 +683,14 @@ def cmd_key(args: argparse.Namespace) -> None:
         modifiers["shiftKey"] = True
     if args.alt:
         modifiers["altKey"] = True
-    b = _connect()
-    try:
+    with _connect() as b:
         b.keypress(args.key_name, tab_id=tab, modifiers=modifiers or None)
         print("ok")
-    finally:
-        b.close()
 
 
 def cmd_scroll(args: argparse.Namespace) -> None:
     tab = _current_tab(args)
-    b = _connect()
-    try:
+    with _connect() as b:
         if args.to:
             b.scroll(target=args.to, tab_id=tab)
         elif args.up:
@@ -574,76 +700,59 @@ def cmd_scroll(args: argparse.Namespace) -> None:
         else:
             b.scroll(y=500, tab_id=tab)  # default: scroll down 500px
         print("ok")
-    finally:
-        b.close()
 
 
 # ── wait ──────────────────────────────────────────────────────────
 
+_WAIT_IDLE_JS = """
+return await new Promise(function(resolve) {
+    if (!window.__agent || !window.__agent.onIdle) {
+        resolve("ready");
+        return;
+    }
+    var timer = setTimeout(function() { resolve("timeout"); }, timeout);
+    window.__agent.onIdle(function() {
+        clearTimeout(timer);
+        resolve("ready");
+    });
+});
+"""
+
+_WAIT_LOAD_JS = """
+return await new Promise(function(resolve) {
+    if (document.readyState === "complete") {
+        resolve("ready");
+        return;
+    }
+    var timer = setTimeout(function() { resolve("timeout"); }, timeout);
+    window.addEventListener("load", function() {
+        clearTimeout(timer);
+        resolve("ready");
+    }, { once: true });
+});
+"""
+
+
 def cmd_wait(args: argparse.Namespace) -> None:
+    if args.idle:
+        js = _WAIT_IDLE_JS
+    elif args.load:
+        js = _WAIT_LOAD_JS
+    else:
+        print("Usage: aslan wait --idle or aslan wait --load", file=sys.stderr)
+        sys.exit(1)
+
     tab = _current_tab(args)
-    b = _connect()
-    try:
-        if args.idle:
-            # Navigate to the current URL with wait_until=idle to trigger idle wait
-            # This uses the browser's built-in readiness detection
-            url = b.get_url(tab_id=tab)
-            js = """
-            return await new Promise(function(resolve) {
-                if (window.__agent && window.__agent._networkIdle && window.__agent._domStable) {
-                    resolve("ready");
-                    return;
-                }
-                var start = Date.now();
-                var check = setInterval(function() {
-                    var idle = !window.__agent || (window.__agent._networkIdle !== false);
-                    var stable = !window.__agent || (window.__agent._domStable !== false);
-                    if (idle && stable) {
-                        clearInterval(check);
-                        resolve("ready");
-                    } else if (Date.now() - start > timeout) {
-                        clearInterval(check);
-                        resolve("timeout");
-                    }
-                }, 100);
-            });
-            """
-            result = b.evaluate(js, tab_id=tab, args={"timeout": args.timeout})
-            print(result or "ready")
-        elif args.load:
-            js = """
-            return await new Promise(function(resolve) {
-                if (document.readyState === "complete") {
-                    resolve("ready");
-                    return;
-                }
-                var start = Date.now();
-                var check = setInterval(function() {
-                    if (document.readyState === "complete") {
-                        clearInterval(check);
-                        resolve("ready");
-                    } else if (Date.now() - start > timeout) {
-                        clearInterval(check);
-                        resolve("timeout");
-                    }
-                }, 100);
-            });
-            """
-            result = b.evaluate(js, tab_id=tab, args={"timeout": args.timeout})
-            print(result or "ready")
-        else:
-            # Default: wait for idle
-            print("Usage: aslan wait --idle or aslan wait --load", file=sys.stderr)
-            sys.exit(1)
-    finally:
-        b.close()
+    with _connect() as b:
+        # Resolved by page events rather than polling
+        result = b.evaluate(js, tab_id=tab, args={"timeout": args.timeout})
+        print(result or "ready")
 
 
 # ── file upload ───────────────────────────────────────────────────
 
 def cmd_upload(args: argparse.Namespace) -> None:
-    import base64
-    import mimetypes
+    from aslan_browser.client import AslanBrowserError
 
     filepath = os.path.abspath(args.file)
     if not os.path.exists(filepath):
@@ -651,58 +760,90 @@ def cmd_upload(args: argparse.Namespace) -> None:
         sys.exit(1)
 
     filename = args.name or os.path.basename(filepath)
-    mimetype = mimetypes.guess_type(filepath)[0] or "application/octet-stream"
+    tab = _current_tab(args)
 
-    with open(filepath, "rb") as f:
-        b64data = base64.b64encode(f.read()).decode()
+    with _connect() as b:
+        try:
+            size = b.upload_file(filepath, selector=args.selector, name=filename, tab_id=tab)
+        except AslanBrowserError as e:
+            if e.code != -32601:
+                raise
+            print(_upload_via_js(b, filepath, filename, args.selector, tab) or "ok")
+        else:
+            print(f"uploaded {filename} ({size} bytes)")
 
-    tab = _current_tab(args)
-    selector = args.selector
 
-    js = """
+_UPLOAD_JS = """
     var input = document.querySelector(sel);
     if (!input) return "error: no element matches selector";
-    var binary = atob(b64data);
-    var bytes = new Uint8Array(binary.length);
-    for (var i = 0; i < binary.length; i++) bytes[i] = binary.charCodeAt(i);
+    var bytes;
+    try {
+        bytes = await (await fetch("data:" + mime + ";base64," + b64data)).arrayBuffer();
+    } catch (e) {
+        // data: fetches can be blocked by the page's CSP
+        bytes = Uint8Array.from(atob(b64data), function (c) { return c.charCodeAt(0); });
+    }
     var file = new File([bytes], fname, { type: mime });
     var dt = new DataTransfer();
     dt.items.add(file);
     input.files = dt.files;
     input.dispatchEvent(new Event("change", { bubbles: true }));
     return "uploaded " + fname + " (" + file.size + " bytes)";
-    """
+"""
 
-    b = _connect()
-    try:
-        result = b.evaluate(
-            js, tab_id=tab,
-            args={"sel": selector, "b64data": b64data, "fname": filename, "mime": mimetype},
-        )
-        print(result or "ok")
-    finally:
-        b.close()
+
+# Common upload types, so most uploads never load the mimetypes database.
+_QUICK_MIME = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+    ".pdf": "application/pdf",
+    ".txt": "text/plain",
+    ".csv": "text/csv",
+    ".json": "application/json",
+}
+
+
+def _guess_mime(filepath: str) -> str:
+    mimetype = _QUICK_MIME.get(os.path.splitext(filepath)[1].lower())
+    if mimetype is None:
+        import mimetypes
+
+        mimetype = mimetypes.guess_type(filepath)[0] or "application/octet-stream"
+    return mimetype
+
+
+def _upload_via_js(b: AslanBrowser, filepath: str, filename: str, selector: str, tab: str) -> Any:
+    """Upload for servers without uploadFile: ship the file base64-encoded through evaluate."""
+    import base64
+
+    mimetype = _guess_mime(filepath)
+    with open(filepath, "rb") as f:
+        b64data = base64.b64encode(f.read()).decode()
+
+    return b.evaluate(
+        _UPLOAD_JS, tab_id=tab,
+        args={"sel": selector, "b64data": b64data, "fname": filename, "mime": mimetype},
+    )
 
 
 # ── screenshots ───────────────────────────────────────────────────
 
 def cmd_shot(args: argparse.Namespace) -> None:
     tab = _current_tab(args)
-    b = _connect()
-    try:
+    with _connect() as b:
         size = b.save_screenshot(args.path, tab_id=tab, quality=args.quality, width=args.width)
         print(f"{args.path} ({size} bytes)")
-    finally:
-        b.close()
 
 
 # ── tab management ────────────────────────────────────────────────
 
 def cmd_tabs(args: argparse.Namespace) -> None:
-    b = _connect()
-    try:
+    with _connect() as b:
         tabs = b.tab_list()
-        current = _load_state().get("tab", "tab0")
+        current = _load_state()
         if getattr(args, "json_output", False):
             _print_json(tabs)
         else:
@@ -712,13 +853,10 @@ def cmd_tabs(args: argparse.Namespace) -> None:
                 url = t.get("url", "")
                 title = t.get("title", "")
                 print(f"{tid}{marker} {url}\t\"{title}\"")
-    finally:
-        b.close()
 
 
 def cmd_tab_new(args: argparse.Namespace) -> None:
-    b = _connect()
-    try:
+    with _connect() as b:
         params = {"width": args.width, "height": args.height}
         if args.url:
             params["url"] = args.url
@@ -730,66 +868,49 @@ def cmd_tab_new(args: argparse.Namespace) -> None:
             _print_json({"tabId": tab_id})
         else:
             print(tab_id)
-    finally:
-        b.close()
 
 
 def cmd_tab_close(args: argparse.Namespace) -> None:
-    tab = args.tab_id if args.tab_id else _load_state().get("tab", "tab0")
-    b = _connect()
-    try:
+    tab = args.tab_id if args.tab_id else _load_state()
+    with _connect() as b:
         b.tab_close(tab)
         # If we closed the current tab, switch to tab0
-        state = _load_state()
-        if state.get("tab") == tab:
+        if _load_state() == tab:
             _set_current_tab("tab0")
             print(f"Closed {tab}. Switched to tab0.")
         else:
             print(f"Closed {tab}.")
-    finally:
-        b.close()
 
 
 def cmd_tab_use(args: argparse.Namespace) -> None:
     # Verify the tab exists
-    b = _connect()
-    try:
-        tabs = b.tab_list()
-        tab_ids = [t["tabId"] for t in tabs]
-        if args.tab_id not in tab_ids:
+    with _connect() as b:
+        if not b.tab_exists(args.tab_id):
+            tab_ids = [t["tabId"] for t in b.tab_list()]
             print(f"Error: tab {args.tab_id} not found. Open tabs: {', '.join(tab_ids)}", file=sys.stderr)
             sys.exit(1)
         _set_current_tab(args.tab_id)
         print(f"Switched to {args.tab_id}")
-    finally:
-        b.close()
 
 
 def cmd_tab_wait(args: argparse.Namespace) -> None:
     tab = _current_tab(args)
-    b = _connect()
-    try:
+    with _connect() as b:
         b.wait_for_selector(args.selector, tab_id=tab, timeout=args.timeout)
         print("found")
-    finally:
-        b.close()
 
 
 # ── learn mode ────────────────────────────────────────────────────
 
 def cmd_learn_start(args: argparse.Namespace) -> None:
-    b = _connect()
-    try:
+    with _connect() as b:
         result = b.learn_start(args.name)
         print(f"Recording: {args.name}")
         print(f"Screenshots: {result.get('screenshotDir', '')}")
-    finally:
-        b.close()
 
 
 def cmd_learn_stop(args: argparse.Namespace) -> None:
-    b = _connect()
-    try:
+    with _connect() as b:
         result = b.learn_stop()
         if getattr(args, "json_output", False):
             _print_json(result)
@@ -801,56 +922,109 @@ def cmd_learn_stop(args: argparse.Namespace) -> None:
             print(f"Actions: {count}")
             print(f"Duration: {duration / 1000:.1f}s")
             print(f"Screenshots: {result.get('screenshotDir', '')}")
-    finally:
-        b.close()
 
 
 def cmd_learn_status(args: argparse.Namespace) -> None:
-    b = _connect()
-    try:
+    with _connect() as b:
         result = b.learn_status()
         if result.get("recording"):
             print(f"Recording: {result.get('name', '?')} ({result.get('actionCount', 0)} actions)")
         else:
             print("Not recording")
-    finally:
-        b.close()
 
 
 # ── cookies ───────────────────────────────────────────────────────
 
 def cmd_cookies(args: argparse.Namespace) -> None:
     tab = _current_tab(args)
-    b = _connect()
-    try:
+    with _connect() as b:
         cookies = b.get_cookies(tab_id=tab, url=getattr(args, "url", None))
         if getattr(args, "json_output", False):
             _print_json(cookies)
         else:
             for c in cookies:
                 print(f"{c['name']}={c['value']}  domain={c['domain']}  path={c.get('path', '/')}")
-    finally:
-        b.close()
 
 
 def cmd_set_cookie(args: argparse.Namespace) -> None:
     tab = _current_tab(args)
-    b = _connect()
-    try:
+    with _connect() as b:
         b.set_cookie(
             args.name, args.value, args.domain,
             path=args.path, expires=args.expires, tab_id=tab,
         )
         print("ok")
-    finally:
-        b.close()
 
 
 # ── Entry point ───────────────────────────────────────────────────
 
+# Hot commands that take only fixed positionals plus --tab/--json skip
+# argparse entirely: command -> (handler, positional dests, flags accepted).
+# Anything these can't express (other flags, -h, a wrong arg count) falls
+# through to the full parser, so errors and help text are unchanged.
+_FAST_PATH = {
+    "status": (cmd_status, (), ()),
+    "source": (cmd_source, (), ()),
+    "back": (cmd_back, (), ("--tab", "--json")),
+    "forward": (cmd_forward, (), ("--tab", "--json")),
+    "reload": (cmd_reload, (), ("--tab", "--json")),
+    "tree": (cmd_tree, (), ("--tab", "--json")),
+    "title": (cmd_title, (), ("--tab",)),
+    "url": (cmd_url, (), ("--tab",)),
+    "eval": (cmd_eval, ("script",), ("--tab", "--json")),
+    "click": (cmd_click, ("target",), ("--tab",)),
+    "fill": (cmd_fill, ("target", "value"), ("--tab",)),
+    "type": (cmd_type, ("target", "value"), ("--tab",)),
+    "select": (cmd_select, ("target", "value"), ("--tab",)),
+    "tabs": (cmd_tabs, (), ("--json",)),
+    "tab:use": (cmd_tab_use, ("tab_id",), ()),
+}
+
+
+def _fast_parse(argv: list[str]) -> Optional[argparse.Namespace]:
+    """Parse ``argv`` for a _FAST_PATH command, or return None to use argparse."""
+    spec = _FAST_PATH.get(argv[0]) if argv else None
+    if spec is None:
+        return None
+    func, dests, flags = spec
+    ns = argparse.Namespace(command=argv[0], func=func)
+    if "--tab" in flags:
+        ns.tab = None
+    if "--json" in flags:
+        ns.json_output = False
+    positionals = []
+    rest = iter(argv[1:])
+    for arg in rest:
+        if not arg.startswith("-"):
+            positionals.append(arg)
+        elif arg not in flags:
+            return None
+        elif arg == "--json":
+            ns.json_output = True
+        else:
+            value = next(rest, None)
+            if value is None or value.startswith("-"):
+                return None
+            ns.tab = value
+    if len(positionals) != len(dests):
+        return None
+    for dest, value in zip(dests, positionals):
+        setattr(ns, dest, value)
+    return ns
+
+
 def main() -> None:
-    parser = _build_parser()
-    args = parser.parse_args()
+    argv = sys.argv[1:]
+    if argv == ["--version"]:
+        print(f"aslan {__version__}")
+        sys.exit(0)
+
+    args = _fast_parse(argv)
+    if args is not None:
+        sys.exit(_run(args.func, args))
+
+    parser = _build_parser(argv[0] if argv else None)
+    args = parser.parse_args(argv)
 
     if not args.command:
         parser.print_help()
@@ -2,12 +2,54 @@
 
 from __future__ import annotations
 
-import base64
+import itertools
 import json
 import os
+import select
 import socket
+import struct
+import threading
 import time
-from typing import Any, Optional
+from functools import lru_cache
+from typing import Any, Iterator, Optional
+
+from aslan_browser.tree import TreeIndex
+
+try:  # Optional speedup: pip install "aslan-browser[fast]"
+    import orjson
+
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+    # orjson parses a memoryview of the receive buffer in place
+    _loads_view = orjson.loads
+except ImportError:
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    _loads = json.loads
+
+    def _loads_view(view: memoryview) -> Any:
+        return json.loads(bytes(view))
+
+try:  # Optional speedup: SIMD base64 for screenshots, also in the fast extra
+    from pybase64 import b64decode as _b64decode
+except ImportError:
+    # binascii reads an ASCII str in place; base64.b64decode would first
+    # copy it into a bytes object.
+    from binascii import a2b_base64 as _b64decode
+
+
+@lru_cache(maxsize=128)
+def _request_prefix(method: str) -> bytes:
+    """Encoded request head for ``method``; only params and id vary per call."""
+    return b'{"jsonrpc":"2.0","method":' + _dumps(method) + b',"params":'
+
+
+def _encode_request(req_id: int, method: str, params: Optional[dict]) -> bytes:
+    """Encode a JSON-RPC request, reusing the cached per-method prefix."""
+    body = _dumps(params) if params else b"{}"
+    return b"%s%s,\"id\":%d}" % (_request_prefix(method), body, req_id)
 
 
 class AslanBrowserError(Exception):
@@ -22,6 +64,129 @@ class AslanBrowserError(Exception):
 _DEFAULT_SOCKET = "/tmp/aslan-browser.sock"
 _RETRY_DELAYS = [0.1, 0.5, 1.0]
 
+# Wire framing: every connection starts as NDJSON and is upgraded to 4-byte
+# big-endian length-prefixed frames when the server supports it.
+_LEN_PREFIX = struct.Struct(">I")
+_RECV_CHUNK = 64 * 1024
+_SOCK_BUFSIZE = 1 << 20
+
+# Idle connections left by close(keep_alive clients only), keyed by socket
+# path, so the next keep_alive client in this process skips connect() and
+# protocol negotiation.  Each entry keeps the negotiated framing and its
+# request-id counter so stale replies can't collide, plus when it was parked.
+# The server broadcasts tab events to every connection and nobody reads a
+# parked one, so entries older than _IDLE_TIMEOUT are closed rather than
+# reused or left to accumulate events.
+_IDLE_MAX = 4
+_IDLE_TIMEOUT = 5.0
+_Conn = tuple[socket.socket, str, Iterator[int]]
+_idle: dict[str, list[tuple[_Conn, float]]] = {}
+_idle_lock = threading.Lock()
+
+
+def _prune_idle(conns: list[tuple[_Conn, float]]) -> list[socket.socket]:
+    """Remove expired entries from ``conns``; returns their sockets to close."""
+    cutoff = time.monotonic() - _IDLE_TIMEOUT
+    expired = [conn[0] for conn, parked in conns if parked < cutoff]
+    if expired:
+        conns[:] = [(conn, parked) for conn, parked in conns if parked >= cutoff]
+    return expired
+
+
+def _take_idle(path: str) -> Optional[_Conn]:
+    """Pop a still-open, recently parked idle connection to ``path``, or None."""
+    while True:
+        with _idle_lock:
+            conns = _idle.get(path, [])
+            expired = _prune_idle(conns)
+            conn = conns.pop()[0] if conns else None
+        for sock in expired:
+            sock.close()
+        if conn is None:
+            return None
+        sock = conn[0]
+        try:
+            if sock.recv(1, socket.MSG_PEEK | socket.MSG_DONTWAIT) != b"":
+                # Unread bytes are events broadcast while it sat idle;
+                # _call skips messages without an id.
+                return conn
+        except BlockingIOError:
+            return conn
+        except OSError:
+            pass
+        sock.close()  # server went away while it sat idle
+
+
+def _give_idle(path: str, conn: _Conn) -> bool:
+    """Park a connection for reuse. Returns False if the pool is full."""
+    with _idle_lock:
+        conns = _idle.setdefault(path, [])
+        expired = _prune_idle(conns)
+        parked = len(conns) < _IDLE_MAX
+        if parked:
+            conns.append((conn, time.monotonic()))
+    for sock in expired:
+        sock.close()
+    return parked
+
+
+def _screenshot_params(
+    tab_id: str,
+    quality: int,
+    width: int,
+    target_kb: Optional[int],
+    max_tries: int,
+) -> dict[str, Any]:
+    params: dict[str, Any] = {"tabId": tab_id, "quality": quality, "width": width}
+    if target_kb is not None:
+        params["targetKB"] = target_kb
+        params["maxTries"] = max_tries
+    return params
+
+
+def _write_b64_file(path: str, data: str) -> int:
+    """Decode a base64 payload into ``path``. Returns the number of bytes written."""
+    raw = _b64decode(data)
+    with open(path, "wb") as f:
+        f.write(raw)
+    return len(raw)
+
+
+def _wait_for_path(path: str, timeout: float) -> None:
+    """Sleep up to ``timeout`` seconds, waking early once ``path`` exists.
+
+    Uses a kqueue vnode watch on the parent directory where available
+    (macOS/BSD) so a freshly launched app is picked up as soon as it binds
+    its socket; elsewhere this is a plain sleep.
+    """
+    if os.path.exists(path) or not hasattr(select, "kqueue"):
+        time.sleep(timeout)
+        return
+    try:
+        fd = os.open(os.path.dirname(path) or ".", os.O_RDONLY)
+    except OSError:
+        time.sleep(timeout)
+        return
+    kq = select.kqueue()
+    try:
+        watch = select.kevent(
+            fd,
+            filter=select.KQ_FILTER_VNODE,
+            flags=select.KQ_EV_ADD | select.KQ_EV_CLEAR,
+            fflags=select.KQ_NOTE_WRITE,
+        )
+        kq.control([watch], 0)
+        deadline = time.monotonic() + timeout
+        # Re-check after registering so a file created in between isn't missed
+        while not os.path.exists(path):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            kq.control(None, 1, remaining)
+    finally:
+        kq.close()
+        os.close(fd)
+
 
 class AslanBrowser:
     """Synchronous client for aslan-browser.
@@ -30,6 +195,10 @@ class AslanBrowser:
     tabs created by this client) on close.  Pass ``auto_session=False`` to
     opt out and manage sessions manually.
 
+    With ``keep_alive=True``, close() leaves the connection open for the next
+    keep_alive client in this process (for up to a few seconds), so
+    short-lived clients created back to back skip connecting again.
+
     Usage::
 
         from aslan_browser import AslanBrowser
@@ -47,14 +216,23 @@ class AslanBrowser:
         *,
         auto_connect: bool = True,
         auto_session: bool = True,
+        keep_alive: bool = False,
     ):
         self._socket_path = socket_path
+        self._keep_alive = keep_alive
         self._sock: Optional[socket.socket] = None
-        self._file = None
-        self._next_id = 0
+        self._lock = threading.Lock()
+        self._framing = "ndjson"
+        self._rbuf = bytearray()
+        self._chunk = bytearray(_RECV_CHUNK)
+        self._ids = itertools.count(1)
         self._auto_session = auto_session
         self._session_id: Optional[str] = None
         self._owned_tabs: list[str] = []
+        # Set while a request is unanswered and after session_create(); either
+        # makes the connection unsafe to hand to another client on close().
+        self._pending = False
+        self._keeps_sessions = False
         if auto_connect:
             self.connect()
 
@@ -75,59 +253,84 @@ class AslanBrowser:
         if self._sock is not None:
             return
 
+        idle = _take_idle(self._socket_path) if self._keep_alive else None
+        if idle is not None:
+            self._sock, self._framing, self._ids = idle
+            self._rbuf.clear()
+            self._start_session()
+            return
+
         last_err: Optional[Exception] = None
         for delay in _RETRY_DELAYS:
             try:
-                if not os.path.exists(self._socket_path):
-                    raise ConnectionError(
-                        f"aslan-browser is not running. Socket not found at {self._socket_path}"
-                    )
                 sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-                sock.connect(self._socket_path)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, _SOCK_BUFSIZE)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, _SOCK_BUFSIZE)
+                try:
+                    # No exists() check first: connect() reports a missing
+                    # socket itself, without the extra stat or its race.
+                    sock.connect(self._socket_path)
+                except OSError as exc:
+                    sock.close()
+                    if isinstance(exc, FileNotFoundError):
+                        raise ConnectionError(
+                            f"aslan-browser is not running. Socket not found at {self._socket_path}"
+                        ) from None
+                    raise
                 self._sock = sock
-                self._file = sock.makefile("rw", encoding="utf-8")
-
-                # Auto-create a session so all tabs are tracked and cleaned up
-                if self._auto_session and self._session_id is None:
-                    try:
-                        result = self._call("session.create", {"name": "sdk-auto"})
-                        self._session_id = result.get("sessionId")
-                    except Exception:
-                        # Server may not support sessions (old binary) — degrade gracefully
-                        self._auto_session = False
-
+                self._framing = "ndjson"
+                self._rbuf.clear()
+                self._negotiate_framing()
+                self._start_session()
                 return
             except (ConnectionError, OSError) as exc:
                 last_err = exc
-                time.sleep(delay)
+                _wait_for_path(self._socket_path, delay)
 
         raise ConnectionError(
             f"Failed to connect to aslan-browser after {len(_RETRY_DELAYS)} attempts: {last_err}"
         )
 
+    def _start_session(self) -> None:
+        """Auto-create a session so all tabs are tracked and cleaned up."""
+        if self._auto_session and self._session_id is None:
+            try:
+                result = self._call("session.create", {"name": "sdk-auto"})
+                self._session_id = result.get("sessionId")
+            except Exception:
+                # Server may not support sessions (old binary) — degrade gracefully
+                self._auto_session = False
+
     def close(self) -> None:
-        """Destroy the auto-session (closing all owned tabs) and disconnect."""
+        """Destroy the auto-session (closing all owned tabs) and disconnect.
+
+        With ``keep_alive=True`` the connection itself is kept open for the
+        next keep_alive client in this process, unless it still owns
+        server-side state: a session created with session_create(), or an
+        auto-session that could not be destroyed.
+        """
+        reusable = self._keep_alive and not self._keeps_sessions
         # Clean up session before closing socket
         if self._session_id and self._auto_session:
             try:
                 self._call("session.destroy", {"sessionId": self._session_id})
             except Exception:
-                pass  # Best-effort; server also cleans up on disconnect
+                reusable = False  # Best-effort; server also cleans up on disconnect
             self._session_id = None
         self._owned_tabs.clear()
 
-        if self._file:
-            try:
-                self._file.close()
-            except OSError:
-                pass
-            self._file = None
+        reusable = reusable and not self._pending and not self._rbuf
+        self._rbuf.clear()
         if self._sock:
-            try:
-                self._sock.close()
-            except OSError:
-                pass
+            conn = (self._sock, self._framing, self._ids)
+            if not (reusable and _give_idle(self._socket_path, conn)):
+                try:
+                    self._sock.close()
+                except OSError:
+                    pass
             self._sock = None
+        self._pending = False
+        self._keeps_sessions = False
 
     def __enter__(self) -> "AslanBrowser":
         return self
@@ -137,36 +340,133 @@ class AslanBrowser:
 
     # ── low-level RPC ────────────────────────────────────────────────
 
+    def _negotiate_framing(self) -> None:
+        """Upgrade the connection to length-prefixed framing if supported."""
+        try:
+            result = self._call("protocol.negotiate", {"framing": "len32"})
+        except AslanBrowserError:
+            return  # Old binary without protocol.negotiate — stay on NDJSON
+        if result and result.get("framing") == "len32":
+            self._framing = "len32"
+
+    def _send(self, body: bytes) -> None:
+        """Write one framed message to the socket."""
+        if self._framing == "len32":
+            self._sock.sendall(_LEN_PREFIX.pack(len(body)) + body)
+        else:
+            self._sock.sendall(body + b"\n")
+
+    def _fill(self) -> None:
+        """Read one chunk from the socket into the receive buffer."""
+        n = self._sock.recv_into(self._chunk)
+        if not n:
+            raise ConnectionError("Connection closed by aslan-browser.")
+        self._rbuf += memoryview(self._chunk)[:n]
+
+    def _recv(self) -> Any:
+        """Read and decode one framed message from the socket."""
+        buf = self._rbuf
+        if self._framing == "len32":
+            while len(buf) < 4:
+                self._fill()
+            length = _LEN_PREFIX.unpack_from(buf)[0]
+            end = 4 + length
+            if len(buf) >= end:
+                # Parse in place; the view must be released before del
+                with memoryview(buf)[4:end] as view:
+                    message = _loads_view(view)
+                del buf[:end]
+                return message
+
+            # Large frame (screenshots, big trees): receive the remainder
+            # straight into a frame-sized buffer instead of via the chunk.
+            message = bytearray(length)
+            have = len(buf) - 4
+            message[:have] = buf[4:]
+            buf.clear()
+            view = memoryview(message)
+            while have < length:
+                n = self._sock.recv_into(view[have:])
+                if not n:
+                    raise ConnectionError("Connection closed by aslan-browser.")
+                have += n
+            return _loads(message)
+
+        # NDJSON: only scan bytes that arrived since the last miss
+        start = 0
+        while True:
+            nl = buf.find(b"\n", start)
+            if nl >= 0:
+                break
+            start = len(buf)
+            self._fill()
+        with memoryview(buf)[:nl] as view:
+            message = _loads_view(view)
+        del buf[: nl + 1]
+        return message
+
     def _call(self, method: str, params: Optional[dict] = None) -> Any:
-        """Send a JSON-RPC request and return the result."""
-        if self._sock is None or self._file is None:
-            raise ConnectionError("Not connected. Call connect() first.")
-
-        self._next_id += 1
-        req_id = self._next_id
-        request = {
-            "jsonrpc": "2.0",
-            "id": req_id,
-            "method": method,
-            "params": params or {},
-        }
-        self._file.write(json.dumps(request) + "\n")
-        self._file.flush()
+        """Send a JSON-RPC request and return the result.
 
-        # Read lines, skipping event notifications (no id), until we get our response
-        while True:
-            line = self._file.readline()
-            if not line:
-                raise ConnectionError("Connection closed by aslan-browser.")
-            response = json.loads(line)
-            # Skip notifications (no id field)
-            if "id" not in response:
-                continue
-            if response["id"] == req_id:
-                if "error" in response:
-                    err = response["error"]
-                    raise AslanBrowserError(err["code"], err["message"])
-                return response.get("result")
+        Thread-safe: concurrent callers take turns on the connection.
+        """
+        with self._lock:
+            if self._sock is None:
+                raise ConnectionError("Not connected. Call connect() first.")
+
+            req_id = next(self._ids)
+            self._pending = True
+            self._send(_encode_request(req_id, method, params))
+
+            # Read messages, skipping event notifications (no id), until we get our response
+            while True:
+                response = self._recv()
+                # Skip notifications (no id field)
+                if "id" not in response:
+                    continue
+                if response["id"] == req_id:
+                    self._pending = False
+                    if "error" in response:
+                        err = response["error"]
+                        raise AslanBrowserError(err["code"], err["message"])
+                    return response.get("result")
+
+    def _call_many(self, requests: list[dict]) -> list[dict]:
+        """Pipeline several requests and return their responses in request order.
+
+        Unlike batch(), each request goes out as its own message in one
+        write, so the server runs them side by side and a slow one doesn't
+        hold back the replies to the others.  Returns the response messages,
+        each with a "result" or "error" key, like batch() items.
+        """
+        with self._lock:
+            if self._sock is None:
+                raise ConnectionError("Not connected. Call connect() first.")
+
+            slots: dict[int, int] = {}
+            frames: list[bytes] = []
+            for i, req in enumerate(requests):
+                req_id = next(self._ids)
+                slots[req_id] = i
+                body = _encode_request(req_id, req["method"], req.get("params"))
+                if self._framing == "len32":
+                    frames += (_LEN_PREFIX.pack(len(body)), body)
+                else:
+                    frames += (body, b"\n")
+            self._pending = True
+            self._sock.sendall(b"".join(frames))
+
+            # Replies arrive in completion order; skip events and stale ids
+            responses: list[Any] = [None] * len(requests)
+            remaining = len(requests)
+            while remaining:
+                response = self._recv()
+                i = slots.pop(response.get("id"), None)
+                if i is not None:
+                    responses[i] = response
+                    remaining -= 1
+            self._pending = False
+            return responses
 
     # ── navigation ───────────────────────────────────────────────────
 
@@ -204,6 +504,25 @@ class AslanBrowser:
             {"tabId": tab_id, "selector": selector, "timeout": timeout},
         )
 
+    def wait_for_node(
+        self,
+        role: str,
+        name_hint: Optional[str] = None,
+        tab_id: str = "tab0",
+        timeout: int = 5000,
+    ) -> dict:
+        """Wait until the accessibility tree has a node with ``role``.
+
+        If ``name_hint`` is given, the node's name or value must also contain
+        it (case-insensitive). Re-checks on DOM mutations in the page, so it
+        returns as soon as the node appears. Returns the matching A11yNode.
+        """
+        params: dict[str, Any] = {"tabId": tab_id, "role": role, "timeout": timeout}
+        if name_hint:
+            params["nameHint"] = name_hint
+        result = self._call("waitForNode", params)
+        return result.get("node", {})
+
     # ── evaluation ───────────────────────────────────────────────────
 
     def evaluate(
@@ -235,6 +554,14 @@ class AslanBrowser:
         result = self._call("getAccessibilityTree", {"tabId": tab_id})
         return result.get("tree", [])
 
+    def get_tree_index(self, tab_id: str = "tab0") -> TreeIndex:
+        """Fetch the accessibility tree once and wrap it in a TreeIndex.
+
+        Reuse the index for every lookup against the same page state instead
+        of fetching the tree again.
+        """
+        return TreeIndex(self.get_accessibility_tree(tab_id=tab_id))
+
     # ── interaction ──────────────────────────────────────────────────
 
     def click(self, target: str, tab_id: str = "tab0") -> None:
@@ -245,10 +572,53 @@ class AslanBrowser:
         """Fill an input element with a value."""
         self._call("fill", {"tabId": tab_id, "selector": target, "value": value})
 
+    def type_into(self, target: str, value: str, tab_id: str = "tab0") -> None:
+        """Click an element, then fill it, in a single sequential batch call."""
+        responses = self.batch(
+            [
+                {"method": "click", "params": {"tabId": tab_id, "selector": target}},
+                {
+                    "method": "fill",
+                    "params": {"tabId": tab_id, "selector": target, "value": value},
+                },
+            ],
+            sequential=True,
+        )
+        for response in responses:
+            if "error" in response:
+                err = response["error"]
+                raise AslanBrowserError(err["code"], err["message"])
+
     def select(self, target: str, value: str, tab_id: str = "tab0") -> None:
         """Select an option in a <select> element."""
         self._call("select", {"tabId": tab_id, "selector": target, "value": value})
 
+    def upload_file(
+        self,
+        path: str,
+        selector: str = 'input[type="file"]',
+        name: Optional[str] = None,
+        mime_type: Optional[str] = None,
+        tab_id: str = "tab0",
+    ) -> int:
+        """Set a local file on a file input and fire ``change``. Returns the size in bytes.
+
+        The server reads the file from ``path`` itself, so no file contents
+        cross the socket. ``name`` and ``mime_type`` default to the file's
+        basename and extension-derived type.
+        """
+        params: dict[str, Any] = {
+            "tabId": tab_id,
+            "selector": selector,
+            "path": os.path.abspath(path),
+        }
+        if name:
+            params["name"] = name
+        if mime_type:
+            params["mimeType"] = mime_type
+        result = self._call("uploadFile", params)
+        return result.get("size", 0)
+
     def keypress(
         self,
         key: str,
@@ -277,13 +647,22 @@ class AslanBrowser:
     # ── screenshots ──────────────────────────────────────────────────
 
     def screenshot(
-        self, tab_id: str = "tab0", quality: int = 70, width: int = 1440
+        self,
+        tab_id: str = "tab0",
+        quality: int = 70,
+        width: int = 1440,
+        target_kb: Optional[int] = None,
+        max_tries: int = 3,
     ) -> bytes:
-        """Take a screenshot. Returns JPEG bytes."""
-        result = self._call(
-            "screenshot", {"tabId": tab_id, "quality": quality, "width": width}
-        )
-        return base64.b64decode(result["data"])
+        """Take a screenshot. Returns JPEG bytes.
+
+        With ``target_kb``, ``quality`` is ignored and the server picks the
+        highest quality (in steps of 10, up to ``max_tries`` encodes) whose
+        JPEG fits in that many KB, remembering it per URL and width.
+        """
+        params = _screenshot_params(tab_id, quality, width, target_kb, max_tries)
+        result = self._call("screenshot", params)
+        return _b64decode(result["data"])
 
     def save_screenshot(
         self,
@@ -291,12 +670,49 @@ class AslanBrowser:
         tab_id: str = "tab0",
         quality: int = 70,
         width: int = 1440,
+        target_kb: Optional[int] = None,
+        max_tries: int = 3,
     ) -> int:
-        """Take a screenshot and save it to a file. Returns the file size in bytes."""
-        data = self.screenshot(tab_id=tab_id, quality=quality, width=width)
-        with open(path, "wb") as f:
-            f.write(data)
-        return len(data)
+        """Take a screenshot and save it to a file. Returns the file size in bytes.
+
+        The server writes the file directly, so the image never crosses the
+        socket; older servers fall back to writing it here.
+        """
+        params = _screenshot_params(tab_id, quality, width, target_kb, max_tries)
+        params["path"] = os.path.abspath(path)
+        result = self._call("screenshot", params)
+        if "size" in result:
+            return result["size"]
+        return _write_b64_file(path, result["data"])
+
+    def snapshot(
+        self, tab_id: str = "tab0", quality: int = 70, width: int = 1440
+    ) -> dict:
+        """Get URL, title and a screenshot of one page state in a single call.
+
+        Returns:
+            {"url": str, "title": str, "screenshot": bytes}
+        """
+        responses = self.batch(
+            [
+                {"method": "getURL", "params": {"tabId": tab_id}},
+                {"method": "getTitle", "params": {"tabId": tab_id}},
+                {
+                    "method": "screenshot",
+                    "params": {"tabId": tab_id, "quality": quality, "width": width},
+                },
+            ]
+        )
+        for resp in responses:
+            if "error" in resp:
+                err = resp["error"]
+                raise AslanBrowserError(err["code"], err["message"])
+        url, title, shot = (resp["result"] for resp in responses)
+        return {
+            "url": url.get("url", ""),
+            "title": title.get("title", ""),
+            "screenshot": _b64decode(shot["data"]),
+        }
 
     # ── cookies ──────────────────────────────────────────────────────
 
@@ -377,6 +793,33 @@ class AslanBrowser:
         result = self._call("tab.list", params)
         return result.get("tabs", [])
 
+    def tab_exists(self, tab_id: str) -> bool:
+        """Check whether a tab is open without fetching the whole tab list."""
+        try:
+            result = self._call("tab.exists", {"tabId": tab_id})
+        except AslanBrowserError as e:
+            if e.code != -32601:
+                raise
+            return any(t.get("tabId") == tab_id for t in self.tab_list())
+        return bool(result.get("exists"))
+
+    def status(self, include_tabs: bool = False) -> dict:
+        """Connection status in one call: ``{socket, tabCount}`` plus ``tabs`` if requested.
+
+        Falls back to ``tab.list`` on servers without the ``status`` method.
+        """
+        params = {"includeTabs": True} if include_tabs else {}
+        try:
+            result = self._call("status", params)
+        except AslanBrowserError as e:
+            if e.code != -32601:
+                raise
+            tabs = self.tab_list()
+            result = {"tabCount": len(tabs)}
+            if include_tabs:
+                result["tabs"] = tabs
+        return {"socket": self._socket_path, **result}
+
     # ── sessions ─────────────────────────────────────────────────────
 
     def session_create(self, name: Optional[str] = None) -> str:
@@ -385,6 +828,7 @@ class AslanBrowser:
         if name:
             params["name"] = name
         result = self._call("session.create", params)
+        self._keeps_sessions = True  # the server drops it when this connection closes
         return result["sessionId"]
 
     def session_destroy(self, session_id: str) -> list[str]:
@@ -415,16 +859,23 @@ class AslanBrowser:
 
     # ── batch operations ─────────────────────────────────────────────
 
-    def batch(self, requests: list[dict]) -> list[dict]:
+    def batch(
+        self, requests: list[dict], sequential: bool = False
+    ) -> list[dict]:
         """Execute multiple requests in one round-trip.
 
         Args:
             requests: List of {"method": ..., "params": ...} dicts.
+            sequential: Run the requests one after another, in order, instead
+                of concurrently. Use for dependent steps like click → fill.
 
         Returns:
             List of {"result": ...} or {"error": ...} dicts, in same order.
         """
-        result = self._call("batch", {"requests": requests})
+        params: dict[str, Any] = {"requests": requests}
+        if sequential:
+            params["sequential"] = True
+        result = self._call("batch", params)
         return result.get("responses", [])
 
     def parallel_get_trees(self, tab_ids: list[str]) -> dict[str, list[dict]]:
@@ -438,14 +889,11 @@ class AslanBrowser:
             {"method": "getAccessibilityTree", "params": {"tabId": tid}}
             for tid in tab_ids
         ]
-        responses = self.batch(requests)
-        result = {}
-        for tid, resp in zip(tab_ids, responses):
-            if "result" in resp:
-                result[tid] = resp["result"].get("tree", [])
-            else:
-                result[tid] = []
-        return result
+        responses = self._call_many(requests)
+        return {
+            tid: resp["result"].get("tree", []) if "result" in resp else []
+            for tid, resp in zip(tab_ids, responses)
+        }
 
     def parallel_navigate(
         self,
@@ -465,14 +913,13 @@ class AslanBrowser:
             {"method": "navigate", "params": {"tabId": tid, "url": url, "waitUntil": wait_until}}
             for tid, url in urls.items()
         ]
-        responses = self.batch(requests)
-        result = {}
-        for (tid, _), resp in zip(urls.items(), responses):
-            if "result" in resp:
-                result[tid] = resp["result"]
-            else:
-                result[tid] = resp.get("error", {"message": "Unknown error"})
-        return result
+        responses = self._call_many(requests)
+        # dicts iterate in insertion order, so the keys line up with requests
+        return {
+            tid: resp["result"] if "result" in resp
+            else resp.get("error", {"message": "Unknown error"})
+            for tid, resp in zip(urls, responses)
+        }
 
     def parallel_screenshots(
         self, tab_ids: list[str], quality: int = 70, width: int = 1440
@@ -486,9 +933,28 @@ class AslanBrowser:
             {"method": "screenshot", "params": {"tabId": tid, "quality": quality, "width": width}}
             for tid in tab_ids
         ]
-        responses = self.batch(requests)
-        result = {}
-        for tid, resp in zip(tab_ids, responses):
-            if "result" in resp and "data" in resp["result"]:
-                result[tid] = base64.b64decode(resp["result"]["data"])
-        return result
+        responses = self._call_many(requests)
+        return {
+            tid: _b64decode(resp["result"]["data"])
+            for tid, resp in zip(tab_ids, responses)
+            if "result" in resp and "data" in resp["result"]
+        }
+
+
+_shared_clients: dict[str, AslanBrowser] = {}
+_shared_lock = threading.Lock()
+
+
+def get_shared_client(socket_path: str = _DEFAULT_SOCKET) -> AslanBrowser:
+    """Return a process-wide AslanBrowser for ``socket_path``.
+
+    The first call connects; later calls (from any thread) reuse the same
+    connection and session instead of opening their own.  Calls are
+    serialised on the connection.  Don't close the shared client unless
+    the whole process is done with it — the next call reconnects if you do.
+    """
+    with _shared_lock:
+        client = _shared_clients.get(socket_path)
+        if client is None or client._sock is None:
+            client = _shared_clients[socket_path] = AslanBrowser(socket_path)
+        return client
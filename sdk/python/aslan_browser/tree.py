@@ -0,0 +1,97 @@
+"""Helpers for querying accessibility trees returned by aslan-browser."""
+
+from __future__ import annotations
+
+import re
+import sys
+from collections import defaultdict
+from functools import lru_cache
+from typing import Iterable, Optional
+
+
+@lru_cache(maxsize=256)
+def _hint_pattern(hints: tuple[str, ...]) -> Optional[re.Pattern[str]]:
+    """Compile lowercased hints into one alternation, so each node's text is
+    scanned once for all hints instead of once per hint."""
+    if not hints:
+        return None
+    return re.compile("|".join(re.escape(h.lower()) for h in hints))
+
+
+class TreeIndex:
+    """Columnar index over a flat accessibility tree.
+
+    Splits the node dicts into parallel ``refs`` / ``roles`` / ``names`` /
+    ``values`` lists once and groups node positions by role.  Each role's
+    lowercased ``name + value`` texts are built the first time that role is
+    hint-searched, so only the roles actually queried pay for lowering.
+    Queries scan plain lists instead of doing several dict lookups per node,
+    and repeated lookups against the same tree don't rescan or re-lowercase
+    anything.  Build one index per tree fetch and reuse it for all queries
+    against that page state.
+
+    Usage::
+
+        from aslan_browser import AslanBrowser, TreeIndex
+
+        with AslanBrowser() as browser:
+            index = TreeIndex(browser.get_accessibility_tree())
+            email = index.find_by_role_and_hint("textbox", ["email", "phone"])
+            buttons = index.refs_by_role("button")
+    """
+
+    def __init__(self, tree: list[dict]):
+        self.tree = tree
+        self.refs: list[str] = [n.get("ref") or "" for n in tree]
+        # Roles come from a small fixed vocabulary; interning them makes the
+        # role-group dict lookups hit the identity fast path.
+        self.roles: list[str] = [sys.intern(n.get("role") or "") for n in tree]
+        self.names: list[str] = [n.get("name") or "" for n in tree]
+        self.values: list[str] = [n.get("value") or "" for n in tree]
+
+        by_role: dict[str, list[int]] = defaultdict(list)
+        for i, role in enumerate(self.roles):
+            by_role[role].append(i)
+        self._by_role = by_role
+        self._texts_by_role: dict[str, list[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.tree)
+
+    def find_by_role(self, role: str) -> list[dict]:
+        """Return all nodes with the given role, in tree order."""
+        tree = self.tree
+        return [tree[i] for i in self._by_role.get(role, ())]
+
+    def refs_by_role(self, role: str) -> list[str]:
+        """Return the ``@eN`` refs of all nodes with the given role, in tree order."""
+        refs = self.refs
+        return [refs[i] for i in self._by_role.get(role, ())]
+
+    def find_by_role_and_hint(
+        self, role: str, hints: Iterable[str]
+    ) -> Optional[dict]:
+        """Return the first node with ``role`` whose name or value contains any hint.
+
+        Matching is case-insensitive substring matching.  Returns None if no
+        node matches.  Each distinct hint list is compiled once (cached across
+        indexes), so reusing the same hints after every tree fetch is cheap.
+        """
+        pattern = _hint_pattern(tuple(hints))
+        if pattern is None:
+            return None
+        search = pattern.search
+        for i, text in zip(self._by_role.get(role, ()), self._role_texts(role)):
+            if search(text):
+                return self.tree[i]
+        return None
+
+    def _role_texts(self, role: str) -> list[str]:
+        """Lowercased ``name value`` of each node with ``role``, built on first use."""
+        texts = self._texts_by_role.get(role)
+        if texts is None:
+            names, values = self.names, self.values
+            texts = self._texts_by_role[role] = [
+                f"{names[i]} {values[i]}".lower() for i in self._by_role.get(role, ())
+            ]
+        return texts
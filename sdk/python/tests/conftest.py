@@ -0,0 +1,81 @@
+"""Shared fixtures for the integration tests. Require aslan-browser to be running.
+
+The suite can run in parallel with pytest-xdist::
+
+    cd sdk/python && python3 -m pytest tests/ -n auto
+
+Each worker drives its own tab.  Learn mode's recorder is server-wide and
+logs every tab's navigations, so the learn tests skip themselves under
+several workers; run tests/test_learn.py without ``-n``.
+"""
+
+import asyncio
+import time
+from urllib.parse import quote
+
+import pytest
+
+from aslan_browser import AslanBrowser
+
+SOCKET_PATH = "/tmp/aslan-browser.sock"
+
+
+def _page(title, body):
+    return "data:text/html;charset=utf-8," + quote(
+        f"<!doctype html><html><head><title>{title}</title></head><body>{body}</body></html>"
+    )
+
+
+# Inline stand-ins for example.com and a second page, so navigation tests
+# don't wait on DNS, TLS and a real download.
+EXAMPLE_URL = _page(
+    "Example Domain",
+    "<h1>Example Domain</h1>"
+    "<p>This domain is for use in documentation examples.</p>"
+    '<p><a href="#more">More information...</a></p>',
+)
+OTHER_URL = _page("Reserved Domains", "<h1>Reserved Domains</h1>")
+
+
+def poll(fn, timeout=3.0, interval=0.02):
+    """Call fn until it returns something truthy and return that; fail after timeout."""
+    deadline = time.monotonic() + timeout
+    while True:
+        result = fn()
+        if result:
+            return result
+        if time.monotonic() > deadline:
+            pytest.fail(f"condition not met within {timeout}s")
+        time.sleep(interval)
+
+
+async def apoll(fn, timeout=3.0, interval=0.02):
+    """Async poll(): await fn() until it returns something truthy."""
+    deadline = time.monotonic() + timeout
+    while True:
+        result = await fn()
+        if result:
+            return result
+        if time.monotonic() > deadline:
+            pytest.fail(f"condition not met within {timeout}s")
+        await asyncio.sleep(interval)
+
+
+@pytest.fixture(scope="session")
+def _shared_browser():
+    """One connected sync client per test process."""
+    b = AslanBrowser(SOCKET_PATH)
+    yield b
+    b.close()
+
+
+@pytest.fixture(scope="session")
+def worker_tab(request):
+    """The tab this test process drives: its own tab under xdist, else tab0."""
+    if not hasattr(request.config, "workerinput"):
+        yield "tab0"
+        return
+    browser = request.getfixturevalue("_shared_browser")
+    tab_id = browser.tab_create()
+    yield tab_id
+    browser.tab_close(tab_id)
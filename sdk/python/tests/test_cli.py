@@ -1,20 +1,107 @@
-"""Integration tests for the aslan CLI. Requires aslan-browser to be running."""
+"""Integration tests for the aslan CLI. Requires aslan-browser to be running.
 
-import json
+Commands run in-process by default. Set ASLAN_TEST_SUBPROC=1 to run each
+one through the installed ``aslan`` binary instead, as a smoke test of the
+real entry point.
+"""
+
+import contextlib
+import io
 import os
 import subprocess
+import sys
+from unittest import mock
 
 import pytest
 
-
-def run_aslan(*args: str, check: bool = True) -> subprocess.CompletedProcess:
-    """Run an aslan CLI command and return the result."""
-    return subprocess.run(
-        ["aslan", *args],
-        capture_output=True,
-        text=True,
-        check=check,
-    )
+from aslan_browser import cli
+
+from .conftest import EXAMPLE_URL
+
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+SUBPROCESS = os.environ.get("ASLAN_TEST_SUBPROC") == "1"
+
+NAV_EXAMPLE = ("nav", EXAMPLE_URL, "--wait", "load")
+
+
+def run_aslan(
+    *args: str, check: bool = True, capture: bool = True, text: bool = True
+) -> subprocess.CompletedProcess:
+    """Run an aslan CLI command and return the result.
+
+    Calls ``cli.main()`` with patched argv and captured stdout/stderr instead
+    of spawning the ``aslan`` binary (unless ASLAN_TEST_SUBPROC=1), so each
+    call skips interpreter startup. With ``capture=False`` output is
+    discarded and ``stdout``/``stderr`` are None, for tests that only check
+    the return code; with ``text=False`` they are undecoded bytes.
+    """
+    argv = ["aslan", *args]
+    if SUBPROCESS:
+        if capture:
+            return subprocess.run(argv, capture_output=True, text=text, check=check)
+        return subprocess.run(
+            argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=check
+        )
+
+    if not capture:
+        out = err = io.StringIO()  # dropped after the call
+    elif text:
+        out, err = io.StringIO(), io.StringIO()
+    else:
+        out, err = _byte_stream(), _byte_stream()
+    cli._cached_tab = None  # a real invocation re-reads the state file
+    with mock.patch.object(sys, "argv", argv), \
+            contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        try:
+            cli.main()
+            code = 0
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else int(e.code is not None)
+    if capture and text:
+        result = subprocess.CompletedProcess(argv, code, out.getvalue(), err.getvalue())
+    elif capture:
+        result = subprocess.CompletedProcess(
+            argv, code, out.buffer.getvalue(), err.buffer.getvalue()
+        )
+    else:
+        result = subprocess.CompletedProcess(argv, code)
+    if check:
+        result.check_returncode()
+    return result
+
+
+def _byte_stream() -> io.TextIOWrapper:
+    """A text stream over a BytesIO, so both text and buffer writes land as bytes."""
+    return io.TextIOWrapper(io.BytesIO(), encoding="utf-8", write_through=True)
+
+
+def _run_raw(*args: str, check: bool = True) -> subprocess.CompletedProcess:
+    """run_aslan() without decoding, for tests that only search the output."""
+    return run_aslan(*args, check=check, text=False)
+
+
+@pytest.fixture(autouse=True)
+def _cli_state(worker_tab, tmp_path, monkeypatch):
+    """Give each test its own CLI state file, starting on this worker's tab."""
+    # XDG_RUNTIME_DIR points a spawned aslan at the same file
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    monkeypatch.setattr(cli, "_STATE_FILE", tmp_path / "aslan-cli.tab")
+    cli._save_state(worker_tab)
+
+
+@pytest.fixture
+def on_example():
+    """Make sure the current tab shows the example page, navigating only if it doesn't.
+
+    Read-only tests share one page load this way; the URL check is a single
+    cheap call, and anything that navigated away gets a fresh load.
+    """
+    if run_aslan("url").stdout.strip() != EXAMPLE_URL:
+        run_aslan(*NAV_EXAMPLE)
 
 
 def test_version():
@@ -28,71 +115,68 @@ def test_status():
 
 
 def test_nav_and_title():
-    run_aslan("nav", "https://example.com", "--wait", "load")
+    run_aslan(*NAV_EXAMPLE)
     r = run_aslan("title")
     assert "Example Domain" in r.stdout
 
 
 def test_nav_json():
-    r = run_aslan("nav", "https://example.com", "--wait", "load", "--json")
-    data = json.loads(r.stdout)
+    r = run_aslan(*NAV_EXAMPLE, "--json")
+    data = _json.loads(r.stdout)
     assert "url" in data
     assert "title" in data
 
 
-def test_tree():
-    run_aslan("nav", "https://example.com", "--wait", "load")
-    r = run_aslan("tree")
-    assert "@e" in r.stdout
-    assert '"' in r.stdout  # quoted names
+def test_tree(on_example):
+    r = _run_raw("tree")
+    assert b"@e" in r.stdout
+    assert b'"' in r.stdout  # quoted names
 
 
-def test_tree_json():
-    run_aslan("nav", "https://example.com", "--wait", "load")
+def test_tree_json(on_example):
     r = run_aslan("tree", "--json")
-    data = json.loads(r.stdout)
+    data = _json.loads(r.stdout)
     assert isinstance(data, list)
     assert len(data) > 0
     assert "ref" in data[0]
 
 
-def test_url():
-    run_aslan("nav", "https://example.com", "--wait", "load")
-    r = run_aslan("url")
-    assert "example.com" in r.stdout
+def test_url(on_example):
+    r = _run_raw("url")
+    assert EXAMPLE_URL.encode() in r.stdout
 
 
-def test_text():
-    run_aslan("nav", "https://example.com", "--wait", "load")
-    r = run_aslan("text", "--chars", "200")
-    assert "Example Domain" in r.stdout
+def test_text(on_example):
+    r = _run_raw("text", "--chars", "200")
+    assert b"Example Domain" in r.stdout
 
 
-def test_eval():
-    run_aslan("nav", "https://example.com", "--wait", "load")
+def test_eval(on_example):
     r = run_aslan("eval", "return document.title")
     assert "Example Domain" in r.stdout
 
 
-def test_screenshot():
-    path = "/tmp/aslan-cli-test.jpg"
-    if os.path.exists(path):
-        os.remove(path)
-    run_aslan("nav", "https://example.com", "--wait", "load")
+def test_screenshot(on_example, tmp_path):
+    path = str(tmp_path / "shot.jpg")
     r = run_aslan("shot", path)
-    assert os.path.exists(path)
     assert "bytes" in r.stdout
+    fd = os.open(path, os.O_RDONLY)  # raises if the file wasn't written
+    try:
+        assert os.read(fd, 2) == b"\xff\xd8"  # JPEG magic bytes
+        assert os.fstat(fd).st_size > 100
+    finally:
+        os.close(fd)
 
 
 def test_click():
-    run_aslan("nav", "https://example.com", "--wait", "load")
+    run_aslan(*NAV_EXAMPLE)
     r = run_aslan("click", "@e0", check=False)
     # @e0 might not be clickable, just verify the command runs
     assert r.returncode == 0 or "Error" in r.stderr
 
 
 def test_tab_lifecycle():
-    r = run_aslan("tab:new", "https://example.com")
+    r = run_aslan("tab:new", EXAMPLE_URL)
     tab_id = r.stdout.strip()
     assert tab_id.startswith("tab")
 
@@ -115,20 +199,19 @@ def test_tab_use():
     run_aslan("tab:close", tab_id)
 
 
-def test_tab_wait():
-    run_aslan("nav", "https://example.com", "--wait", "load")
+def test_tab_wait(on_example):
     r = run_aslan("tab:wait", "h1", "--timeout", "3000")
     assert "found" in r.stdout
 
 
 def test_key():
-    run_aslan("nav", "https://example.com", "--wait", "load")
-    r = run_aslan("key", "Tab")
+    run_aslan(*NAV_EXAMPLE)
+    r = run_aslan("key", "Tab", capture=False)
     assert r.returncode == 0
 
 
 def test_scroll():
-    run_aslan("nav", "https://example.com", "--wait", "load")
+    run_aslan(*NAV_EXAMPLE)
     r = run_aslan("scroll", "--down", "200")
     assert r.returncode == 0
     assert "ok" in r.stdout
@@ -140,7 +223,7 @@ def test_source():
 
 
 def test_back_forward():
-    run_aslan("nav", "https://example.com", "--wait", "load")
+    run_aslan(*NAV_EXAMPLE)
     # back/forward may not have history but should not crash
     r = run_aslan("back", check=False)
     assert r.returncode == 0 or "Error" in r.stderr
@@ -149,26 +232,24 @@ def test_back_forward():
 
 
 def test_reload():
-    run_aslan("nav", "https://example.com", "--wait", "load")
-    r = run_aslan("reload")
+    run_aslan(*NAV_EXAMPLE)
+    r = run_aslan("reload", capture=False)
     assert r.returncode == 0
 
 
-def test_html():
-    run_aslan("nav", "https://example.com", "--wait", "load")
-    r = run_aslan("html", "--chars", "500")
-    assert "<h1>" in r.stdout or "Example Domain" in r.stdout
+def test_html(on_example):
+    r = _run_raw("html", "--chars", "500")
+    assert b"<h1>" in r.stdout or b"Example Domain" in r.stdout
 
 
-def test_html_selector():
-    run_aslan("nav", "https://example.com", "--wait", "load")
+def test_html_selector(on_example):
     r = run_aslan("html", "--selector", "h1")
     assert "Example Domain" in r.stdout
 
 
 def test_type():
     # Type into a page with an input — use eval to create one
-    run_aslan("nav", "https://example.com", "--wait", "load")
+    run_aslan(*NAV_EXAMPLE)
     run_aslan("eval", "var i = document.createElement('input'); i.id='test-input'; document.body.appendChild(i); return 'ok'")
     r = run_aslan("type", "#test-input", "hello world")
     assert "typed" in r.stdout
@@ -177,13 +258,11 @@ def test_type():
     assert "hello world" in r.stdout
 
 
-def test_wait_load():
-    run_aslan("nav", "https://example.com", "--wait", "load")
+def test_wait_load(on_example):
     r = run_aslan("wait", "--load", "--timeout", "5000")
     assert "ready" in r.stdout
 
 
-def test_wait_idle():
-    run_aslan("nav", "https://example.com", "--wait", "load")
+def test_wait_idle(on_example):
     r = run_aslan("wait", "--idle", "--timeout", "5000")
     assert "ready" in r.stdout
@@ -8,23 +8,31 @@ Usage:
 
 import asyncio
 import os
-import tempfile
-import time
 
 import pytest
 import pytest_asyncio
 
 from aslan_browser import AslanBrowser, AsyncAslanBrowser, AslanBrowserError
 
+from .conftest import EXAMPLE_URL, OTHER_URL, apoll, poll
+
 SOCKET_PATH = "/tmp/aslan-browser.sock"
 
 
 @pytest.fixture
-def browser():
-    """Create a connected sync browser client."""
-    b = AslanBrowser(SOCKET_PATH)
-    yield b
-    b.close()
+def browser(_shared_browser, worker_tab):
+    """The shared sync client, reset to a blank page after each test."""
+    yield _shared_browser
+    _shared_browser.navigate("about:blank", tab_id=worker_tab)
+
+
+@pytest.fixture(scope="module")
+def example_tree(_shared_browser, worker_tab):
+    """The accessibility tree of the example page, fetched once for read-only tests."""
+    _shared_browser.navigate(EXAMPLE_URL, tab_id=worker_tab)
+    tree = poll(lambda: _shared_browser.get_accessibility_tree(tab_id=worker_tab))
+    _shared_browser.navigate("about:blank", tab_id=worker_tab)
+    return tree
 
 
 @pytest_asyncio.fixture
@@ -40,115 +48,106 @@ async def async_browser():
 
 
 class TestSyncNavigation:
-    def test_navigate(self, browser):
-        result = browser.navigate("https://example.com")
-        assert "example.com" in result["url"]
+    def test_navigate(self, browser, worker_tab):
+        result = browser.navigate(EXAMPLE_URL, tab_id=worker_tab)
+        assert result["url"] == EXAMPLE_URL
 
-    def test_get_title(self, browser):
-        browser.navigate("https://example.com")
-        title = browser.get_title()
+    def test_get_title(self, browser, worker_tab):
+        browser.navigate(EXAMPLE_URL, tab_id=worker_tab)
+        title = browser.get_title(tab_id=worker_tab)
         assert isinstance(title, str)
         assert len(title) > 0
 
-    def test_get_url(self, browser):
-        browser.navigate("https://example.com")
-        url = browser.get_url()
-        assert "example.com" in url
+    def test_get_url(self, browser, worker_tab):
+        browser.navigate(EXAMPLE_URL, tab_id=worker_tab)
+        url = browser.get_url(tab_id=worker_tab)
+        assert url == EXAMPLE_URL
 
-    def test_go_back_forward(self, browser):
-        browser.navigate("https://example.com")
-        browser.navigate("https://www.iana.org/domains/reserved")
-        result = browser.go_back()
-        assert "example.com" in result["url"]
-        result = browser.go_forward()
-        assert "iana.org" in result["url"]
+    def test_go_back_forward(self, browser, worker_tab):
+        browser.navigate(EXAMPLE_URL, tab_id=worker_tab)
+        browser.navigate(OTHER_URL, tab_id=worker_tab)
+        result = browser.go_back(tab_id=worker_tab)
+        assert result["url"] == EXAMPLE_URL
+        result = browser.go_forward(tab_id=worker_tab)
+        assert result["url"] == OTHER_URL
 
-    def test_reload(self, browser):
-        browser.navigate("https://example.com")
-        result = browser.reload()
-        assert "example.com" in result["url"]
+    def test_reload(self, browser, worker_tab):
+        browser.navigate(EXAMPLE_URL, tab_id=worker_tab)
+        result = browser.reload(tab_id=worker_tab)
+        assert result["url"] == EXAMPLE_URL
 
 
 class TestSyncEvaluation:
-    def test_evaluate(self, browser):
-        browser.navigate("https://example.com")
-        result = browser.evaluate("return 1 + 1")
+    def test_evaluate(self, browser, worker_tab):
+        browser.navigate(EXAMPLE_URL, tab_id=worker_tab)
+        result = browser.evaluate("return 1 + 1", tab_id=worker_tab)
         assert result == 2
 
-    def test_evaluate_string(self, browser):
-        browser.navigate("https://example.com")
-        result = browser.evaluate("return document.title")
+    def test_evaluate_string(self, browser, worker_tab):
+        browser.navigate(EXAMPLE_URL, tab_id=worker_tab)
+        result = browser.evaluate("return document.title", tab_id=worker_tab)
         assert isinstance(result, str)
 
 
 class TestSyncAccessibilityTree:
-    def test_get_tree(self, browser):
-        browser.navigate("https://example.com")
-        time.sleep(0.5)
-        tree = browser.get_accessibility_tree()
-        assert isinstance(tree, list)
-        assert len(tree) > 0
+    def test_get_tree(self, example_tree):
+        assert isinstance(example_tree, list)
+        assert len(example_tree) > 0
 
-    def test_tree_node_structure(self, browser):
-        browser.navigate("https://example.com")
-        time.sleep(0.5)
-        tree = browser.get_accessibility_tree()
-        node = tree[0]
+    def test_tree_node_structure(self, example_tree):
+        node = example_tree[0]
         assert "ref" in node
         assert "role" in node
         assert "name" in node
 
 
 class TestSyncInteraction:
-    def test_click_by_ref(self, browser):
-        browser.navigate("https://example.com")
-        time.sleep(0.5)
-        tree = browser.get_accessibility_tree()
+    def test_click_by_ref(self, browser, worker_tab):
+        # Refs live on the page's DOM, so this needs a fresh tree, not example_tree.
+        browser.navigate(EXAMPLE_URL, tab_id=worker_tab)
+        tree = poll(lambda: browser.get_accessibility_tree(tab_id=worker_tab))
         links = [n for n in tree if n["role"] == "link"]
         assert len(links) > 0
-        browser.click(links[0]["ref"])  # Should not raise
+        browser.click(links[0]["ref"], tab_id=worker_tab)  # Should not raise
 
-    def test_fill(self, browser):
-        browser.navigate("https://example.com")
-        time.sleep(0.5)
+    def test_fill(self, browser, worker_tab):
+        browser.navigate(EXAMPLE_URL, tab_id=worker_tab)
         browser.evaluate(
-            "var i = document.createElement('input'); i.id='sdk-test'; document.body.appendChild(i); return true;"
+            "var i = document.createElement('input'); i.id='sdk-test'; document.body.appendChild(i); return true;",
+            tab_id=worker_tab,
         )
-        browser.fill("#sdk-test", "hello from SDK")
-        result = browser.evaluate("return document.getElementById('sdk-test').value")
+        browser.fill("#sdk-test", "hello from SDK", tab_id=worker_tab)
+        result = browser.evaluate("return document.getElementById('sdk-test').value", tab_id=worker_tab)
         assert result == "hello from SDK"
 
 
 class TestSyncScreenshot:
-    def test_screenshot_bytes(self, browser):
-        browser.navigate("https://example.com")
-        time.sleep(1)
-        data = browser.screenshot(quality=50, width=800)
+    def test_screenshot_bytes(self, browser, worker_tab):
+        browser.navigate(EXAMPLE_URL, wait_until="idle", tab_id=worker_tab)
+        data = browser.screenshot(quality=50, width=800, tab_id=worker_tab)
         assert isinstance(data, bytes)
         assert len(data) > 100
         assert data[:2] == b"\xff\xd8"  # JPEG magic bytes
 
-    def test_save_screenshot(self, browser):
-        browser.navigate("https://example.com")
-        time.sleep(1)
-        with tempfile.NamedTemporaryFile(suffix=".jpg", delete=False) as f:
-            path = f.name
+    def test_save_screenshot(self, browser, worker_tab, tmp_path):
+        browser.navigate(EXAMPLE_URL, wait_until="idle", tab_id=worker_tab)
+        path = str(tmp_path / "shot.jpg")
+        size = browser.save_screenshot(path, quality=50, width=800, tab_id=worker_tab)
+        assert size > 100
+        fd = os.open(path, os.O_RDONLY)  # raises if the file wasn't written
         try:
-            size = browser.save_screenshot(path, quality=50, width=800)
-            assert size > 100
-            assert os.path.exists(path)
-            with open(path, "rb") as f:
-                assert f.read(2) == b"\xff\xd8"
+            assert os.read(fd, 2) == b"\xff\xd8"
+            assert os.fstat(fd).st_size == size
         finally:
-            os.unlink(path)
+            os.close(fd)
 
 
 class TestSyncCookies:
-    def test_set_and_get_cookie(self, browser):
-        browser.navigate("https://example.com")
-        time.sleep(0.5)
-        browser.set_cookie("sdk_test", "sdk_value", ".example.com")
-        cookies = browser.get_cookies(url="https://example.com")
+    def test_set_and_get_cookie(self, browser, worker_tab):
+        # Cookies need a real origin, so this one still loads example.com
+        browser.navigate("https://example.com", tab_id=worker_tab)
+        browser.set_cookie("sdk_test", "sdk_value", ".example.com", tab_id=worker_tab)
+        cookies = browser.get_cookies(url="https://example.com", tab_id=worker_tab)
         found = [c for c in cookies if c["name"] == "sdk_test"]
         assert len(found) > 0
         assert found[0]["value"] == "sdk_value"
@@ -163,18 +162,35 @@ class TestSyncTabs:
         assert "tab0" in tab_ids
 
     def test_tab_create_and_close(self, browser):
-        tab_id = browser.tab_create(url="https://example.com")
+        tab_id = browser.tab_create(url=EXAMPLE_URL)
         assert tab_id.startswith("tab")
+        assert tab_id in browser.owned_tabs
 
         tabs = browser.tab_list()
         tab_ids = [t["tabId"] for t in tabs]
         assert tab_id in tab_ids
 
         browser.tab_close(tab_id)
+        assert tab_id not in browser.owned_tabs
         tabs = browser.tab_list()
         tab_ids = [t["tabId"] for t in tabs]
         assert tab_id not in tab_ids
 
+    def test_sequential_batch(self, browser):
+        # Items run in order, so tab.list sees the tab created just before it
+        created, listed, closed = browser.batch(
+            [
+                {"method": "tab.create", "params": {"url": EXAMPLE_URL}},
+                {"method": "tab.list", "params": {}},
+                {"method": "tab.close", "params": {"tabId": "tab-missing"}},
+            ],
+            sequential=True,
+        )
+        tab_id = created["result"]["tabId"]
+        assert tab_id in [t["tabId"] for t in listed["result"]["tabs"]]
+        assert "error" in closed  # unknown tab: reported per item, not raised
+        browser.tab_close(tab_id)
+
 
 class TestSyncErrors:
     def test_invalid_method(self, browser):
@@ -189,15 +205,29 @@ class TestSyncErrors:
 
     def test_tab_not_found(self, browser):
         with pytest.raises(AslanBrowserError) as exc_info:
-            browser.navigate("https://example.com", tab_id="nonexistent")
+            browser.navigate(EXAMPLE_URL, tab_id="nonexistent")
         assert exc_info.value.code == -32000
 
 
 class TestSyncContextManager:
-    def test_with_statement(self):
+    def test_with_statement(self, worker_tab):
         with AslanBrowser(SOCKET_PATH) as browser:
-            result = browser.navigate("https://example.com")
-            assert "example.com" in result["url"]
+            result = browser.navigate(EXAMPLE_URL, tab_id=worker_tab)
+            assert result["url"] == EXAMPLE_URL
+
+    def test_close_parks_connection_for_reuse(self):
+        first = AslanBrowser(SOCKET_PATH, keep_alive=True)
+        sock = first._sock
+        first.close()
+        with AslanBrowser(SOCKET_PATH, keep_alive=True) as second:
+            assert second._sock is sock
+            assert second.get_url() is not None
+
+    def test_close_disconnects_by_default(self):
+        first = AslanBrowser(SOCKET_PATH)
+        sock = first._sock
+        first.close()
+        assert sock.fileno() == -1
 
 
 class TestSyncConnectionError:
@@ -210,31 +240,29 @@ class TestSyncConnectionError:
 
 
 class TestAsyncNavigation:
-    async def test_navigate(self, async_browser):
-        result = await async_browser.navigate("https://example.com")
-        assert "example.com" in result["url"]
+    async def test_navigate(self, async_browser, worker_tab):
+        result = await async_browser.navigate(EXAMPLE_URL, tab_id=worker_tab)
+        assert result["url"] == EXAMPLE_URL
 
-    async def test_get_title(self, async_browser):
-        await async_browser.navigate("https://example.com")
-        title = await async_browser.get_title()
+    async def test_get_title(self, async_browser, worker_tab):
+        await async_browser.navigate(EXAMPLE_URL, tab_id=worker_tab)
+        title = await async_browser.get_title(tab_id=worker_tab)
         assert isinstance(title, str)
         assert len(title) > 0
 
 
 class TestAsyncAccessibilityTree:
-    async def test_get_tree(self, async_browser):
-        await async_browser.navigate("https://example.com")
-        await asyncio.sleep(0.5)
-        tree = await async_browser.get_accessibility_tree()
+    async def test_get_tree(self, async_browser, worker_tab):
+        await async_browser.navigate(EXAMPLE_URL, tab_id=worker_tab)
+        tree = await apoll(lambda: async_browser.get_accessibility_tree(tab_id=worker_tab))
         assert isinstance(tree, list)
         assert len(tree) > 0
 
 
 class TestAsyncScreenshot:
-    async def test_screenshot_bytes(self, async_browser):
-        await async_browser.navigate("https://example.com")
-        await asyncio.sleep(1)
-        data = await async_browser.screenshot(quality=50, width=800)
+    async def test_screenshot_bytes(self, async_browser, worker_tab):
+        await async_browser.navigate(EXAMPLE_URL, wait_until="idle", tab_id=worker_tab)
+        data = await async_browser.screenshot(quality=50, width=800, tab_id=worker_tab)
         assert isinstance(data, bytes)
         assert len(data) > 100
         assert data[:2] == b"\xff\xd8"
@@ -242,24 +270,37 @@ class TestAsyncScreenshot:
 
 class TestAsyncTabs:
     async def test_tab_create_and_close(self, async_browser):
-        tab_id = await async_browser.tab_create(url="https://example.com")
+        tab_id = await async_browser.tab_create(url=EXAMPLE_URL)
         assert tab_id.startswith("tab")
         await async_browser.tab_close(tab_id)
 
+    async def test_concurrent_tabs(self, async_browser):
+        # Independent calls in flight together on one connection
+        tab_ids = await asyncio.gather(
+            async_browser.tab_create(url=EXAMPLE_URL),
+            async_browser.tab_create(url=OTHER_URL),
+        )
+        assert len(set(tab_ids)) == 2
+        urls = await asyncio.gather(*(async_browser.get_url(tab_id=t) for t in tab_ids))
+        assert urls[0] == EXAMPLE_URL
+        assert urls[1] == OTHER_URL
+        await asyncio.gather(*(async_browser.tab_close(t) for t in tab_ids))
+
 
 class TestAsyncContextManager:
-    async def test_async_with(self):
+    async def test_async_with(self, worker_tab):
         async with AsyncAslanBrowser(SOCKET_PATH) as browser:
-            result = await browser.navigate("https://example.com")
-            assert "example.com" in result["url"]
+            result = await browser.navigate(EXAMPLE_URL, tab_id=worker_tab)
+            assert result["url"] == EXAMPLE_URL
 
 
 class TestAsyncEvents:
-    async def test_event_callback(self, async_browser):
+    @pytest.mark.slow
+    async def test_event_callback(self, async_browser, worker_tab):
         events = []
         async_browser.on_event(lambda e: events.append(e))
-        await async_browser.navigate("https://example.com")
+        await async_browser.navigate(EXAMPLE_URL, tab_id=worker_tab)
         await asyncio.sleep(0.5)
-        await async_browser.evaluate("console.log('async event test'); return true;")
+        await async_browser.evaluate("console.log('async event test'); return true;", tab_id=worker_tab)
         await asyncio.sleep(0.5)
         # Events may or may not arrive depending on timing — just verify no crash
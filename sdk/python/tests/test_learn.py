@@ -4,32 +4,50 @@ Requires the aslan-browser app to be running.
 
 Usage:
     cd sdk/python && python3 -m pytest tests/test_learn.py -v
+
+The recorder is server-wide and logs navigations and tab create/close from
+every tab, so these tests are skipped when xdist runs several workers; run
+them without ``-n`` to include them.
 """
 
 import json
 import os
-import time
 
 import pytest
 
 from aslan_browser import AslanBrowser, AslanBrowserError
 
+from .conftest import EXAMPLE_URL, poll
+
 SOCKET_PATH = "/tmp/aslan-browser.sock"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session", autouse=True)
+def _single_worker(request):
+    """Skip beside other xdist workers: the recorder would log their tabs too."""
+    workerinput = getattr(request.config, "workerinput", None)
+    if workerinput and workerinput.get("workercount", 1) > 1:
+        pytest.skip("learn mode records every tab; run without xdist workers")
+
+
+@pytest.fixture(scope="session")
 def browser():
-    """Create a connected sync browser client (no auto session)."""
+    """One connected sync browser client (no auto session) for all learn tests."""
     b = AslanBrowser(SOCKET_PATH, auto_session=False)
     yield b
-    # Safety: always stop recording if still active
+    b.close()
+
+
+@pytest.fixture(autouse=True)
+def _reset_learn(browser):
+    """Safety: always stop recording if a test left it active."""
+    yield
     try:
-        status = b.learn_status()
+        status = browser.learn_status()
         if status.get("recording"):
-            b.learn_stop()
+            browser.learn_stop()
     except Exception:
         pass
-    b.close()
 
 
 # ── Status ────────────────────────────────────────────────────────────────
@@ -45,30 +63,34 @@ def test_learn_status_default(browser):
 # ── Start / Stop lifecycle ────────────────────────────────────────────────
 
 
-def test_learn_start_stop(browser):
-    """Start and stop recording."""
+def test_learn_lifecycle(browser):
+    """One recording: start, status, double start, stop, stop again."""
     result = browser.learn_start("test-session")
-    assert result["ok"] is True
-    assert result["name"] == "test-session"
-    assert "screenshotDir" in result
+    try:
+        assert result["ok"] is True
+        assert result["name"] == "test-session"
+        assert "screenshotDir" in result
+        # learn.start creates the screenshot directory
+        assert os.path.isdir(result["screenshotDir"])
 
-    status = browser.learn_status()
-    assert status["recording"] is True
-    assert status["name"] == "test-session"
+        status = browser.learn_status()
+        assert status["recording"] is True
+        assert status["name"] == "test-session"
+
+        # Cannot start recording while already recording
+        with pytest.raises(AslanBrowserError):
+            browser.learn_start("another-test")
+    finally:
+        log = browser.learn_stop()
 
-    log = browser.learn_stop()
     assert log["name"] == "test-session"
     assert "duration" in log
     assert "actions" in log
     assert isinstance(log["actions"], list)
 
-
-def test_learn_start_creates_directory(browser):
-    """learn.start creates the screenshot directory."""
-    result = browser.learn_start("dir-test")
-    screenshot_dir = result["screenshotDir"]
-    assert os.path.isdir(screenshot_dir)
-    browser.learn_stop()
+    # Cannot stop when not recording
+    with pytest.raises(AslanBrowserError):
+        browser.learn_stop()
 
 
 def test_learn_start_cleans_old_directory(browser):
@@ -81,25 +103,6 @@ def test_learn_start_cleans_old_directory(browser):
     browser.learn_stop()
 
 
-# ── Error cases ───────────────────────────────────────────────────────────
-
-
-def test_learn_double_start_fails(browser):
-    """Cannot start recording while already recording."""
-    browser.learn_start("double-test")
-    try:
-        with pytest.raises(AslanBrowserError):
-            browser.learn_start("another-test")
-    finally:
-        browser.learn_stop()
-
-
-def test_learn_stop_when_not_recording_fails(browser):
-    """Cannot stop when not recording."""
-    with pytest.raises(AslanBrowserError):
-        browser.learn_stop()
-
-
 # ── Navigation capture ────────────────────────────────────────────────────
 
 
@@ -107,17 +110,20 @@ def test_learn_captures_navigation(browser):
     """Navigation during recording creates action entries."""
     browser.learn_start("nav-test")
     try:
-        browser.navigate("https://example.com", wait_until="idle")
-        # Give time for screenshot capture (500ms delay + write)
-        time.sleep(1.5)
+        browser.navigate(EXAMPLE_URL, wait_until="idle")
+        # The navigation action is logged once its screenshot is captured
+        poll(lambda: browser.learn_status()["actionCount"] >= 1)
         log = browser.learn_stop()
     except Exception:
         browser.learn_stop()
         raise
-    # Should have at least one navigation action
-    nav_actions = [a for a in log["actions"] if a.get("type") == "navigation"]
+    # Should have at least one navigation action on the tab this test drove
+    nav_actions = [
+        a for a in log["actions"]
+        if a.get("type") == "navigation" and a.get("tabId") == "tab0"
+    ]
     assert len(nav_actions) >= 1
-    assert "example.com" in nav_actions[0].get("url", "")
+    assert nav_actions[0].get("url") == EXAMPLE_URL
 
 
 # ── Screenshots ───────────────────────────────────────────────────────────
@@ -127,13 +133,17 @@ def test_learn_screenshot_files_exist(browser):
     """Screenshots are saved to disk during recording."""
     browser.learn_start("screenshot-test")
     try:
-        browser.navigate("https://example.com", wait_until="idle")
-        time.sleep(2)  # Wait for screenshot capture (500ms delay + file write)
+        browser.navigate(EXAMPLE_URL, wait_until="idle")
+        poll(lambda: browser.learn_status()["actionCount"] >= 1)
         log = browser.learn_stop()
     except Exception:
         browser.learn_stop()
         raise
-    screenshots = [a["screenshot"] for a in log["actions"] if "screenshot" in a]
+    screenshots = [
+        a["screenshot"] for a in log["actions"]
+        if "screenshot" in a and a.get("tabId") == "tab0"
+    ]
     assert len(screenshots) >= 1
     for path in screenshots:
-        assert os.path.exists(path), f"Missing screenshot: {path}"
+        # Files are written in the background after the action is logged
+        poll(lambda: os.path.exists(path), timeout=2.0)
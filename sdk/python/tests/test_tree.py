@@ -0,0 +1,56 @@
+"""Unit tests for TreeIndex. No running browser required."""
+
+import sys
+
+from aslan_browser import TreeIndex
+
+TREE = [
+    {"ref": "@e0", "role": "heading", "name": "Sign in"},
+    {"ref": "@e1", "role": "textbox", "name": "Email or phone", "value": ""},
+    {"ref": "@e2", "role": "textbox", "name": "", "value": "Kennwort"},
+    {"ref": "@e3", "role": "button", "name": "Weiter"},
+    {"ref": "@e4", "role": "button", "name": "Create account"},
+    {"ref": "@e5", "role": "link", "name": "Help"},
+]
+
+
+def test_find_by_role():
+    index = TreeIndex(TREE)
+    assert [n["ref"] for n in index.find_by_role("button")] == ["@e3", "@e4"]
+    assert index.find_by_role("checkbox") == []
+
+
+def test_columns():
+    index = TreeIndex(TREE)
+    assert index.refs == ["@e0", "@e1", "@e2", "@e3", "@e4", "@e5"]
+    assert index.roles[3] == "button"
+    assert index.values[0] == ""
+    assert index.refs_by_role("textbox") == ["@e1", "@e2"]
+
+
+def test_roles_interned():
+    tree = [{"ref": f"@e{i}", "role": "".join(["but", "ton"])} for i in range(3)]
+    index = TreeIndex(tree)
+    assert index.roles[0] is index.roles[2] is sys.intern("button")
+
+
+def test_find_by_role_and_hint():
+    index = TreeIndex(TREE)
+    assert index.find_by_role_and_hint("button", ["next", "weiter"])["ref"] == "@e3"
+    # hints are literal text, not patterns
+    assert index.find_by_role_and_hint("button", ["wei.er"]) is None
+    assert index.find_by_role_and_hint("button", []) is None
+    assert index.find_by_role_and_hint("textbox", ["EMAIL"])["ref"] == "@e1"
+    # value is searched too
+    assert index.find_by_role_and_hint("textbox", ["kennwort"])["ref"] == "@e2"
+    assert index.find_by_role_and_hint("link", ["next"]) is None
+    # generators and repeated hint lists give the same answer
+    assert index.find_by_role_and_hint("button", (h for h in ["WEITER"]))["ref"] == "@e3"
+    assert index.find_by_role_and_hint("button", ["next", "weiter"])["ref"] == "@e3"
+
+
+def test_missing_fields():
+    index = TreeIndex([{"ref": "@e0"}, {"ref": "@e1", "role": "button", "value": None}])
+    assert len(index) == 2
+    assert index.roles == ["", "button"]
+    assert index.find_by_role_and_hint("button", ["x"]) is None
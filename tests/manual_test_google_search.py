@@ -11,37 +11,50 @@ sys.path.insert(0, "/Users/onorbumbum/_PROJECTS/aslan-browser/aslan-browser/sdk/
 from aslan_browser import AslanBrowser
 
 
-def flatten_tree(nodes, results=None, depth=0):
-    """Recursively flatten accessibility tree into a list."""
-    if results is None:
-        results = []
-    for node in nodes:
-        results.append(node)
-        if node.get("children"):
-            flatten_tree(node["children"], results, depth + 1)
-    return results
+SEARCH_ROLES = {"textbox", "searchbox", "combobox", "textField", "searchField"}
+
+
+def walk_tree(nodes):
+    """Yield every node of an accessibility tree in document (pre-)order.
+
+    Uses an explicit stack, so deep DOMs can't hit the recursion limit.
+    """
+    stack = list(reversed(nodes))
+    while stack:
+        node = stack.pop()
+        yield node
+        children = node.get("children")
+        if children:
+            stack.extend(reversed(children))
+
+
+def flatten_tree(nodes):
+    """Flatten accessibility tree into a list."""
+    return list(walk_tree(nodes))
 
 
 def find_search_result_links(tree_nodes):
     """Find organic search result links from flattened a11y tree."""
     links = []
+    seen = set()
     for node in tree_nodes:
-        role = node.get("role", "")
-        url = node.get("url", "") or node.get("href", "")
-        name = node.get("name", "").strip()
-
-        # Look for link nodes that are real organic results
-        # Google organic results have URLs starting with http (not google internal)
-        if role == "link" and url and name:
-            if (url.startswith("http") and
-                "google.com" not in url and
-                "youtube.com" not in url.lower() or "dentist" in name.lower()):
-                # Filter for real external links
-                if ("google.com" not in url and
-                    url.startswith("http") and
-                    len(name) > 10):
-                    if url not in [l["url"] for l in links]:
-                        links.append({"name": name, "url": url})
+        get = node.get
+        if get("role", "") != "link":
+            continue
+        url = get("url", "") or get("href", "")
+        name = get("name", "").strip()
+
+        # Real external results: http(s), not Google-internal, a meaningful
+        # title, and no YouTube links unless they're about dentists
+        if (
+            url.startswith("http")
+            and "google.com" not in url
+            and len(name) > 10
+            and ("youtube.com" not in url.lower() or "dentist" in name.lower())
+            and url not in seen
+        ):
+            seen.add(url)
+            links.append({"name": name, "url": url})
     return links
 
 
@@ -75,13 +88,9 @@ def main():
         tree = browser.get_accessibility_tree(tab_id="tab0")
 
         def find_search_ref(nodes):
-            for n in nodes:
-                role = n.get("role", "")
-                if role in ["textbox", "searchbox", "combobox", "textField", "searchField"]:
+            for n in walk_tree(nodes):
+                if n.get("role", "") in SEARCH_ROLES:
                     return n.get("ref")
-                ref = find_search_ref(n.get("children", []))
-                if ref:
-                    return ref
             return None
 
         search_ref = find_search_ref(tree)